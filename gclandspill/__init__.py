@@ -9,13 +9,54 @@
 """A hydrocarbon overland flow simulator for pipeline rupture events.
 """
 import sys
-sys.modules["clawpack"] = sys.modules["gclandspill"] # trick python to believe this is also clawpack
+import importlib
+import importlib.abc
+import importlib.machinery
 
-from . import pyclaw
-from . import clawutil
-from . import amrclaw
-from . import geoclaw
-from . import data
+
+class _ClawpackAlias(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    """Trick python to believe this is also clawpack.
+
+    `clawpack` and `clawpack.<name>` resolve to the very same module objects as `gclandspill` and
+    `gclandspill.<name>`, so the bundled clawpack code is never initialized twice under two names.
+    """
+
+    @classmethod
+    def find_spec(cls, fullname, path=None, target=None):  # pylint: disable=unused-argument
+        """Return a spec only for clawpack and its submodules."""
+        if fullname == "clawpack" or fullname.startswith("clawpack."):
+            return importlib.machinery.ModuleSpec(fullname, cls)
+        return None
+
+    @staticmethod
+    def create_module(spec):
+        """Return the already-imported (or newly imported) gclandspill counterpart."""
+        module = importlib.import_module("gclandspill" + spec.name[len("clawpack"):])
+        spec.loader_state = module.__spec__  # importlib overwrites `__spec__` with the alias spec
+        return module
+
+    @staticmethod
+    def exec_module(module):
+        """Restore the module's own spec; it was initialized under its gclandspill name."""
+        module.__spec__ = module.__spec__.loader_state
+
+
+sys.meta_path.insert(0, _ClawpackAlias)
+
+# subpackages are only imported when first accessed, e.g., `gclandspill.data` (PEP 562)
+__all__ = ["pyclaw", "clawutil", "amrclaw", "geoclaw", "data"]
+
+
+def __getattr__(name):
+    if name in __all__:
+        module = importlib.import_module("." + name, __name__)
+        globals()[name] = module  # later lookups no longer go through __getattr__
+        return module
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
 
 # meta
 __version__ = "1.0"
@@ -9,20 +9,108 @@
 """Main function of geoclaw-landspill.
 """
 import os
+import sys
+import json
 import pathlib
 import argparse
+import functools
 import subprocess
+import concurrent.futures
 import psutil
-import gclandspill
-from gclandspill._preprocessing import create_data
-from gclandspill._postprocessing.netcdf import convert_to_netcdf
-from gclandspill._postprocessing.plotdepth import plot_depth
-from gclandspill._postprocessing.plottopo import plot_topo
-from gclandspill._postprocessing.volumes import create_volume_csv
+from gclandspill import _misc
+
+
+# number of usable logical CPU cores (respecting the CPU affinity, e.g., in containers or on HPC)
+_DEFAULT_NPROCS = _misc.usable_cpus()
+
+# subcommands allowed in a manifest of the `batch` command
+_BATCH_COMMANDS = ("createnc", "plotdepth", "plottopo", "volumes")
+
+# help messages of CMD arguments that are long or shared by several commands
+_HELP_SOLN_DIR = (
+    "Customize the folder holding solution files. A relative path will be assumed to be relative "
+    "to CASE. (default: _output)"
+)
+_HELP_EXEC = (
+    "Replace the Python process with the solver instead of running the solver as a child "
+    "process, so the Python interpreter does not stay in memory during the simulation. The "
+    "solver's messages are then only shown in the terminal and not saved to _output/run.log."
+)
+_HELP_NC_DEST_DIR = (
+    "Customize the folder to save output file. A relative path will be assumed to be relative to "
+    "CASE. Ignored if FILENAME is an absolute path. (default: same as SOLNDIR)"
+)
+_HELP_NC_FILENAME = (
+    "Customize the output raster file name. A relative path will be assumed to be relative to "
+    "DESTDIR. (default: case name + level)"
+)
+_HELP_DEPTH_DEST_DIR = (
+    "Customize the folder to save figures. A relative path will be assumed to be relative to "
+    "CASE. (default: <CASE>/_plots/depth/level<LEVEL>)"
+)
+_HELP_TOPO_AZDEG = (
+    "The azimuth (0-360 degrees clockwise from North) of the light source. Only works if the "
+    "topography is shown in shaded mode. (Defaults: 45 degrees)."
+)
+_HELP_TOPO_ALTDEG = (
+    "The altitude (0-90 degrees up from horizontal) of the light source. Only works if the "
+    "topography is shown in shaded mode. (Defaults: 25 degrees)."
+)
+_HELP_TOPO_DEST_DIR = (
+    "Customize the folder to save figures. A relative path will be assumed to be relative to "
+    "CASE. (default: <CASE>/_plots/topo)"
+)
+_HELP_VOLUMES_DEST_DIR = (
+    "Customize the folder to save output file. A relative path will be assumed to be relative to "
+    "<CASE>. Ignored if <FILENAME> is an absolute path. (default: same as <SOLNDIR>)"
+)
+_HELP_VOLUMES_FILENAME = (
+    "Customize the output CSV file name. A relative path will be assumed to be relative to "
+    "<DESTDIR>. (default: volumes.csv)"
+)
+_DESC_BATCH = (
+    "Run post-processing commands (createnc, plotdepth, plottopo, and volumes) listed in a JSON "
+    "manifest within a single geoclaw-landspill session. The manifest is a list of jobs, and "
+    "each job is the list of arguments one would pass to geoclaw-landspill, e.g., "
+    '[["plotdepth", "case-1"], ["volumes", "case-2", "--frame-ed", "10"]]. Relative paths are '
+    "relative to the current working directory."
+)
+_HELP_BATCH_NPROCS = (
+    "Number of jobs to run concurrently. When larger than 1, jobs not specifying their own "
+    "--nprocs use only one process each. (default: 1, i.e., run jobs one by one)"
+)
+_HELP_NPROCS = "Number of processers to use. (default: all usable logical CPU cores)"
+_HELP_LEVEL = "Use data from a specific AMR level (default: finest level)"
+_HELP_DRY_TOL = "Customize the dry tolerance (default: get from setrun.py)"
+_HELP_EXTENT = "Customize the output extent (default: determine from solutions)"
+_HELP_CMAP = "Colormap name for depth plosts (default: viridis)"
+_HELP_BORDER = "Also plot the borders of grid patches"
 
 
 def main():
     """Main function of geoclaw-landspill."""
+
+    # fast path for the most common usage, `geoclaw-landspill run CASE`, which needs no parser;
+    # the namespace must match what the `run` subparser produces with default values
+    if len(sys.argv) == 3 and sys.argv[1] == "run" and not sys.argv[2].startswith("-"):
+        args = argparse.Namespace(
+            cmd="run", case=_abs_path(sys.argv[2]), log_level=None, exec_solver=False, func=run)
+        return args.func(args)
+
+    # parse the cmd
+    args = _build_parser().parse_args()
+
+    # `--nprocs` defaults to None in the parser, so `batch` can tell if a job sets it explicitly
+    if getattr(args, "nprocs", 1) is None:
+        args.nprocs = _DEFAULT_NPROCS
+
+    # execute the corresponding subcommand and return code
+    return args.func(args)
+
+
+@functools.lru_cache(maxsize=1)
+def _build_parser():
+    """Build the CMD parser; built once and reused by later `main()` calls in the same process."""
     # pylint: disable=too-many-statements
 
     # main CMD parser
@@ -35,7 +123,26 @@ def main():
     )
 
     parser.add_argument(
-        "--version", action='version', version='%(prog)s {}'.format(gclandspill.__version__))
+        "--version", action=_LazyVersionAction)
+
+    # the target case; shared by all commands
+    parent_case = argparse.ArgumentParser(add_help=False)
+    parent_case.add_argument(
+        "case", action="store", type=_abs_path, metavar="CASE",
+        help="The path to the target case directory."
+    )
+
+    # the solution frames to process; shared by post-processing commands
+    parent_frames = argparse.ArgumentParser(add_help=False)
+    parent_frames.add_argument(
+        '--frame-bg', dest="frame_bg", action="store", type=int, default=0, metavar="FRAMEBG",
+        help='Customize beginning frame No. (default: 0)')
+    parent_frames.add_argument(
+        '--frame-ed', dest="frame_ed", action="store", type=int, metavar="FRAMEED",
+        help='Customize end frame No. (default: get from setrun.py)')
+    parent_frames.add_argument(
+        '--soln-dir', dest="soln_dir", action="store", type=pathlib.Path, default="_output",
+        metavar="SOLNDIR", help=_HELP_SOLN_DIR)
 
     # subparser group
     subparsers = parser.add_subparsers(dest="cmd", metavar="<COMMAND>", required=True)
@@ -43,53 +150,32 @@ def main():
     # `run` command
     # ----------------------------------------------------------------------------------------------
     parser_run = subparsers.add_parser(
-        name="run", help="Run a simulation.", description="Run a simulation.")
-    parser_run.add_argument(
-        "case", action="store", type=pathlib.Path, metavar="CASE",
-        help="The path to the target case directory."
-    )
+        name="run", help="Run a simulation.", description="Run a simulation.",
+        parents=[parent_case])
     parser_run.add_argument(
         '--log-level', dest="log_level", action="store", type=int, default=None,
         help='Overwrite the log verbosity in the config file `setrun.py` (default: no overwrite)')
+    parser_run.add_argument(
+        '--exec', dest="exec_solver", action="store_true",
+        help=_HELP_EXEC)
     parser_run.set_defaults(func=run)  # set the corresponding callback for the `run` command
 
     # `createnc` command
     # ----------------------------------------------------------------------------------------------
     parser_createnc = subparsers.add_parser(
         name="createnc", help="Convert simulation results to NetCDF file with CF convention.",
-        description="Convert simulation results to NetCDF file with CF convention."
-    )
-    parser_createnc.add_argument(
-        "case", action="store", type=pathlib.Path, metavar="CASE",
-        help="The path to the target case directory."
+        description="Convert simulation results to NetCDF file with CF convention.",
+        parents=[parent_case, parent_frames]
     )
     parser_createnc.add_argument(
         '--level', dest="level", action="store", type=int,
-        help='Use data from a specific AMR level (default: finest level)')
-    parser_createnc.add_argument(
-        '--frame-bg', dest="frame_bg", action="store", type=int, default=0, metavar="FRAMEBG",
-        help='Customize beginning frame No. (default: 0)')
-    parser_createnc.add_argument(
-        '--frame-ed', dest="frame_ed", action="store", type=int, metavar="FRAMEED",
-        help='Customize end frame No. (default: get from setrun.py)')
-    parser_createnc.add_argument(
-        '--soln-dir', dest="soln_dir", action="store", type=pathlib.Path, default="_output",
-        metavar="SOLNDIR", help="""
-            Customize the folder holding solution files. A relative path will be assumed to be
-            relative to CASE. (default: _output)
-        """)
+        help=_HELP_LEVEL)
     parser_createnc.add_argument(
         '--dest-dir', dest="dest_dir", action="store", type=pathlib.Path, metavar="DESTDIR",
-        help="""
-            Customize the folder to save output file. A relative path will be assumed to be
-            relative to CASE. Ignored if FILENAME is an absolute path. (default: same as SOLNDIR)')
-        """)
+        help=_HELP_NC_DEST_DIR)
     parser_createnc.add_argument(
         '--filename', dest="filename", action="store", type=pathlib.Path,
-        help="""
-            Customize the output raster file name. A relative path will be assumed to be
-            relative to DESTDIR. (default: case name + level)
-        """)
+        help=_HELP_NC_FILENAME)
     parser_createnc.add_argument(
         '--extent', dest="extent", action="store", nargs=4, type=float, default=None,
         metavar=("XMIN", "YMIN", "XMAX", "YMAX"),
@@ -99,56 +185,38 @@ def main():
         help='Customize the output raster resolution (default: determine from solutions)')
     parser_createnc.add_argument(
         '--dry-tol', dest="dry_tol", action="store", type=float, default=None,
-        help='Customize the dry tolerance (default: get from setrun.py)')
+        help=_HELP_DRY_TOL)
     parser_createnc.add_argument(
         '--nodata', dest="nodata", action="store", type=int, default=-9999,
         help='Customize the nodata value (default: -9999)')
     parser_createnc.add_argument(
         "--use-case-settings", dest="use_case_settings", action="store_true",
         help="Use the timestamp settings in case_settings.txt under CASE")
-    parser_createnc.set_defaults(func=convert_to_netcdf)  # callback for the `createnc` command
+    parser_createnc.set_defaults(func=_convert_to_netcdf)  # callback for the `createnc` command
 
     # `plotdepth` command
     # ----------------------------------------------------------------------------------------------
     parser_plotdepth = subparsers.add_parser(
         name="plotdepth", help="Plot depth and output to a PNG figure per time frame.",
-        description="Plot depth and output to a PNG figure per time frame."
-    )
-    parser_plotdepth.add_argument(
-        "case", action="store", type=pathlib.Path, metavar="CASE",
-        help="The path to the target case directory."
+        description="Plot depth and output to a PNG figure per time frame.",
+        parents=[parent_case, parent_frames]
     )
     parser_plotdepth.add_argument(
-        '--nprocs', dest="nprocs", action="store", type=int,
-        help='Number of processers to use. (default: all usable logical CPU cores)')
+        '--nprocs', dest="nprocs", action="store", type=int, default=None,
+        help=_HELP_NPROCS)
     parser_plotdepth.add_argument(
         '--level', dest="level", action="store", type=int,
-        help='Use data from a specific AMR level (default: finest level)')
-    parser_plotdepth.add_argument(
-        '--frame-bg', dest="frame_bg", action="store", type=int, default=0, metavar="FRAMEBG",
-        help='Customize beginning frame No. (default: 0)')
-    parser_plotdepth.add_argument(
-        '--frame-ed', dest="frame_ed", action="store", type=int, metavar="FRAMEED",
-        help='Customize end frame No. (default: get from setrun.py)')
-    parser_plotdepth.add_argument(
-        '--soln-dir', dest="soln_dir", action="store", type=pathlib.Path, default="_output",
-        metavar="SOLNDIR", help="""
-            Customize the folder holding solution files. A relative path will be assumed to be
-            relative to CASE. (default: _output)
-        """)
+        help=_HELP_LEVEL)
     parser_plotdepth.add_argument(
         '--dest-dir', dest="dest_dir", action="store", type=pathlib.Path, metavar="DESTDIR",
-        help="""
-            Customize the folder to save figures. A relative path will be assumed to be relative to
-            CASE. (default: <CASE>/_plots/depth/level<LEVEL>))
-        """)
+        help=_HELP_DEPTH_DEST_DIR)
     parser_plotdepth.add_argument(
         '--extent', dest="extent", action="store", nargs=4, type=float, default=None,
         metavar=("XMIN", "YMIN", "XMAX", "YMAX"),
-        help='Customize the output extent (default: determine from solutions)')
+        help=_HELP_EXTENT)
     parser_plotdepth.add_argument(
         '--dry-tol', dest="dry_tol", action="store", type=float, default=None, metavar="DRYTOL",
-        help='Customize the dry tolerance (default: get from setrun.py)')
+        help=_HELP_DRY_TOL)
     parser_plotdepth.add_argument(
         '--cmax', dest="cmax", action="store", type=float,
         help='Maximum value in the depth colorbar (default: obtained from solution)')
@@ -157,7 +225,7 @@ def main():
         help='Minimum value in the depth colorbar (default: 0)')
     parser_plotdepth.add_argument(
         '--cmap', dest="cmap", action="store", type=str, default="viridis",
-        help='Colormap name for depth plosts (default: viridis)')
+        help=_HELP_CMAP)
     parser_plotdepth.add_argument(
         '--use-sat', dest="use_sat", action="store_true",
         help="If sepcified, use satellite image instead of topography as the background.")
@@ -169,16 +237,10 @@ def main():
         help="If sepcified, use colorized colormap for topographic elevation.")
     parser_plotdepth.add_argument(
         "--topo-azdeg", action="store", type=int, default=45, metavar="TOPOAZDEG",
-        help="""
-            The azimuth (0-360 degrees clockwise from North) of the light source. Only works if
-            the topography is shown in shaded mode. (Defaults: 45 degrees).
-        """)
+        help=_HELP_TOPO_AZDEG)
     parser_plotdepth.add_argument(
         "--topo-altdeg", action="store", type=int, default=25, metavar="TOPOALTDEG",
-        help="""
-            The altitude (0-90 degrees up from horizontal) of the light source. Only works if
-            the topography is shown in shaded mode. (Defaults: 25 degrees).
-        """)
+        help=_HELP_TOPO_ALTDEG)
     parser_plotdepth.add_argument(
         '--topo-cmax', action="store", type=float, metavar="TOPOCMAX",
         help='Maximum value in the elevation colorbar (default: obtained from solution)')
@@ -187,47 +249,29 @@ def main():
         help='Minimum value in the elevation colorbar (default:  obtained from solution)')
     parser_plotdepth.add_argument(
         '--border', dest="border", action="store_true",
-        help='Also plot the borders of grid patches')
-    parser_plotdepth.set_defaults(func=plot_depth)  # callback for the `plotdepth` command
+        help=_HELP_BORDER)
+    parser_plotdepth.set_defaults(func=_plot_depth)  # callback for the `plotdepth` command
 
     # `plottopo` command
     # ----------------------------------------------------------------------------------------------
     parser_plottopo = subparsers.add_parser(
         name="plottopo", help="Plot runtime topography and output to a PNG figure per time frame.",
-        description="This plots the topography data on AMR grids during simulation runtime."
-    )
-    parser_plottopo.add_argument(
-        "case", action="store", type=pathlib.Path, metavar="CASE",
-        help="The path to the target case directory."
+        description="This plots the topography data on AMR grids during simulation runtime.",
+        parents=[parent_case, parent_frames]
     )
     parser_plottopo.add_argument(
-        '--nprocs', dest="nprocs", action="store", type=int,
-        help='Number of processers to use. (default: all usable logical CPU cores)')
+        '--nprocs', dest="nprocs", action="store", type=int, default=None,
+        help=_HELP_NPROCS)
     parser_plottopo.add_argument(
         '--level', dest="level", action="store", type=int,
         help='Plot up to this level (default: finest level)')
-    parser_plottopo.add_argument(
-        '--frame-bg', dest="frame_bg", action="store", type=int, default=0, metavar="FRAMEBG",
-        help='Customize beginning frame No. (default: 0)')
-    parser_plottopo.add_argument(
-        '--frame-ed', dest="frame_ed", action="store", type=int, metavar="FRAMEED",
-        help='Customize end frame No. (default: get from setrun.py)')
-    parser_plottopo.add_argument(
-        '--soln-dir', dest="soln_dir", action="store", type=pathlib.Path, default="_output",
-        metavar="SOLNDIR", help="""
-            Customize the folder holding solution files. A relative path will be assumed to be
-            relative to CASE. (default: _output)
-        """)
     parser_plottopo.add_argument(
         '--dest-dir', dest="dest_dir", action="store", type=pathlib.Path, metavar="DESTDIR",
-        help="""
-            Customize the folder to save figures. A relative path will be assumed to be relative to
-            CASE. (default: <CASE>/_plots/topo))
-        """)
+        help=_HELP_TOPO_DEST_DIR)
     parser_plottopo.add_argument(
         '--extent', dest="extent", action="store", nargs=4, type=float, default=None,
         metavar=("XMIN", "YMIN", "XMAX", "YMAX"),
-        help='Customize the output extent (default: determine from solutions)')
+        help=_HELP_EXTENT)
     parser_plottopo.add_argument(
         '--cmax', dest="cmax", action="store", type=float,
         help='Maximum value of runtime elevation (default: determined from aux files)')
@@ -236,57 +280,173 @@ def main():
         help='Minimum value of runtime elevation (default: determined from aux files)')
     parser_plottopo.add_argument(
         '--cmap', dest="cmap", action="store", type=str, default="viridis",
-        help='Colormap name for depth plosts (default: viridis)')
+        help=_HELP_CMAP)
     parser_plottopo.add_argument(
         '--border', dest="border", action="store_true",
-        help='Also plot the borders of grid patches')
-    parser_plottopo.set_defaults(func=plot_topo)  # callback for the `plottopo` command
+        help=_HELP_BORDER)
+    parser_plottopo.set_defaults(func=_plot_topo)  # callback for the `plottopo` command
 
     # `volumes` command
     # ----------------------------------------------------------------------------------------------
     parser_volumes = subparsers.add_parser(
         name="volumes", help="Calculate the total volumes at each AMR level.",
-        description="Calculate and return a CSV file for total volumes at all AMR levels."
-    )
-    parser_volumes.add_argument(
-        "case", action="store", type=pathlib.Path, metavar="CASE",
-        help="The path to the target case directory."
+        description="Calculate and return a CSV file for total volumes at all AMR levels.",
+        parents=[parent_case, parent_frames]
     )
     parser_volumes.add_argument(
-        '--frame-bg', dest="frame_bg", action="store", type=int, default=0, metavar="FRAMEBG",
-        help='Customize beginning frame No. (default: 0)')
-    parser_volumes.add_argument(
-        '--frame-ed', dest="frame_ed", action="store", type=int, metavar="FRAMEED",
-        help='Customize end frame No. (default: get from setrun.py)')
-    parser_volumes.add_argument(
-        '--soln-dir', dest="soln_dir", action="store", type=pathlib.Path, default="_output",
-        metavar="SOLNDIR", help="""
-            Customize the folder holding solution files. A relative path will be assumed to be
-            relative to CASE. (default: _output)
-        """)
+        '--nprocs', dest="nprocs", action="store", type=int, default=None,
+        help=_HELP_NPROCS)
     parser_volumes.add_argument(
         '--dest-dir', dest="dest_dir", action="store", type=pathlib.Path, metavar="DESTDIR",
-        help="""
-            Customize the folder to save output file. A relative path will be assumed to be
-            relative to <CASE>. Ignored if <FILENAME> is an absolute path. (default: same as
-            <SOLNDIR>)')
-        """)
+        help=_HELP_VOLUMES_DEST_DIR)
     parser_volumes.add_argument(
         '--filename', dest="filename", action="store", type=pathlib.Path,
-        help="""
-            Customize the output CSV file name. A relative path will be assumed to be
-            relative to <DESTDIR>. (default: volumes.csv)
-        """)
-    parser_volumes.set_defaults(func=create_volume_csv)  # callback for the `volumes` command
+        help=_HELP_VOLUMES_FILENAME)
+    parser_volumes.set_defaults(func=_create_volume_csv)  # callback for the `volumes` command
 
-    # parse the cmd
+    # `batch` command
     # ----------------------------------------------------------------------------------------------
-    args = parser.parse_args()
+    parser_batch = subparsers.add_parser(
+        name="batch", help="Run post-processing commands of many cases listed in a manifest.",
+        description=_DESC_BATCH
+    )
+    parser_batch.add_argument(
+        "manifest", action="store", type=_abs_path, metavar="MANIFEST",
+        help="The path to the JSON manifest."
+    )
+    parser_batch.add_argument(
+        '--nprocs', dest="nprocs", action="store", type=int, default=1,
+        help=_HELP_BATCH_NPROCS)
+    parser_batch.set_defaults(func=_run_batch)  # callback for the `batch` command
 
-    # execute the corresponding subcommand and return code
+    return parser
+
+
+# callbacks of subcommands; the actual modules (and matplotlib, rasterio, etc.) are only imported
+# when the corresponding subcommand is executed
+# pylint: disable=import-outside-toplevel
+
+def _convert_to_netcdf(args: argparse.Namespace):
+    """Callback of the `createnc` command."""
+    from gclandspill._postprocessing.netcdf import convert_to_netcdf
+    return convert_to_netcdf(args)
+
+
+def _use_agg_backend():
+    """Plotting commands only write image files; use Agg so no GUI toolkit is loaded (or needed)."""
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def _plot_depth(args: argparse.Namespace):
+    """Callback of the `plotdepth` command."""
+    _use_agg_backend()
+    from gclandspill._postprocessing.plotdepth import plot_depth
+    return plot_depth(args)
+
+
+def _plot_topo(args: argparse.Namespace):
+    """Callback of the `plottopo` command."""
+    _use_agg_backend()
+    from gclandspill._postprocessing.plottopo import plot_topo
+    return plot_topo(args)
+
+
+def _create_volume_csv(args: argparse.Namespace):
+    """Callback of the `volumes` command."""
+    from gclandspill._postprocessing.volumes import create_volume_csv
+    return create_volume_csv(args)
+
+# pylint: enable=import-outside-toplevel
+
+
+def _run_batch(args: argparse.Namespace):
+    """Callback of the `batch` command.
+
+    Arguments
+    ---------
+    args : argparse.Namespace
+        The CMD arguments parsed by `argparse` package.
+
+    Returns
+    -------
+    Execution code. 0 means all jobs succeeded. Otherwise, the code of the first failed job.
+    """
+
+    with open(args.manifest, "r") as fileobj:
+        jobs = json.load(fileobj)
+
+    if not isinstance(jobs, list):
+        raise ValueError("The manifest {} is not a list of jobs".format(args.manifest))
+
+    # parse all jobs first, so a typo in the manifest is reported before any job runs
+    parser = _build_parser()
+    job_args = []
+    for job in jobs:
+        if not isinstance(job, list):
+            raise ValueError("Job {} in {} is not a list of arguments".format(job, args.manifest))
+
+        job = [str(arg) for arg in job]
+
+        if not job or job[0] not in _BATCH_COMMANDS:
+            raise ValueError("Unsupported job {} in {}; allowed commands: {}".format(
+                job, args.manifest, ", ".join(_BATCH_COMMANDS)))
+
+        job_args.append(parser.parse_args(job))
+
+        # jobs not setting --nprocs use one process if jobs already run concurrently (to avoid
+        # overcommitting CPUs), otherwise all usable CPU cores
+        if getattr(job_args[-1], "nprocs", 1) is None:
+            job_args[-1].nprocs = 1 if args.nprocs > 1 else _DEFAULT_NPROCS
+
+    if args.nprocs == 1:
+        codes = [_run_batch_job(job) for job in job_args]
+    else:
+        # ProcessPoolExecutor's workers are not daemonic, so jobs can still spawn their own pools
+        with concurrent.futures.ProcessPoolExecutor(args.nprocs) as executor:
+            codes = list(executor.map(_run_batch_job, job_args))
+
+    return next((code for code in codes if code != 0), 0)
+
+
+def _run_batch_job(args: argparse.Namespace):
+    """Execute a job of the `batch` command."""
+    print("Running job: {} {}".format(args.cmd, args.case))
     return args.func(args)
 
 
+class _LazyVersionAction(argparse.Action):
+    """Print the version and exit; the package is only imported when `--version` is used."""
+    # pylint: disable=too-few-public-methods, redefined-builtin
+
+    def __init__(self, option_strings, dest=argparse.SUPPRESS, default=argparse.SUPPRESS,
+                 help="show program's version number and exit"):
+        super().__init__(option_strings, dest, nargs=0, default=default, help=help)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        import gclandspill  # pylint: disable=import-outside-toplevel
+        print("{} {}".format(parser.prog, gclandspill.__version__))
+        parser.exit()
+
+
+def _abs_path(path: str):
+    """Convert a CMD argument to an absolute path, so later steps don't have to resolve it again."""
+    return _misc.abs_path(path)  # same conversion as the Python API, sharing its cache
+
+
+@functools.lru_cache(maxsize=1)
+def _get_solver():
+    """Get the path to the Fortran solver binary; the lookup is done once per process."""
+
+    import gclandspill  # pylint: disable=import-outside-toplevel
+    solver = pathlib.Path(gclandspill.__file__).parent.joinpath("bin", "geoclaw-landspill-bin")
+
+    if not solver.is_file():  # not cached; raised again on the next call
+        raise FileNotFoundError("Couldn't find solver at {}".format(solver))
+
+    return solver
+
+
 def run(args: argparse.Namespace):
     """Run a simulation using geoclaw-landspill Fortran binary.
 
@@ -306,28 +466,44 @@ def run(args: argparse.Namespace):
     if "OMP_NUM_THREADS" not in os.environ:
         os.environ["OMP_NUM_THREADS"] = "{}".format(psutil.cpu_count(False))
 
-    # process path
-    args.case = args.case.expanduser().resolve()
-    assert args.case.is_dir()
+    # the case path was already made absolute by the CMD parser; raises even under `python -O`
+    _misc.check_folder(args.case)
 
     # the output folder of simulation results of this run
     args.output = args.case.joinpath("_output")
 
     # create *.data files, topology files, and hydrological file
+    from gclandspill._preprocessing import create_data  # pylint: disable=import-outside-toplevel
     create_data(args.case, args.log_level, args.output)
 
     # get the Fortran solver binary
-    solver = pathlib.Path(gclandspill.__file__).parent.joinpath("bin", "geoclaw-landspill-bin")
+    solver = _get_solver()
 
-    if not solver.is_file():
-        raise FileNotFoundError("Couldn't find solver at {}".format(solver))
+    # replace this process with the solver; os.execv never returns on success
+    if args.exec_solver:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.chdir(args.output)
+        os.execv(solver, [str(solver)])
+
+    # gfortran buffers stdout when it's a pipe; disable that to keep the progress messages live
+    env = dict(os.environ)
+    env.setdefault("GFORTRAN_UNBUFFERED_PRECONNECTED", "y")
+
+    # execute the solver and stream its messages to both the terminal and a log file
+    with subprocess.Popen(
+        [solver], cwd=str(args.output), env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+        bufsize=1, universal_newlines=True, encoding="utf-8", errors="replace"
+    ) as proc, open(args.output.joinpath("run.log"), "w") as log:
+        for line in proc.stdout:
+            sys.stdout.write(line)
+            log.write(line)
 
-    # execute the solver
-    result = subprocess.run([solver], capture_output=False, cwd=str(args.output), check=True)
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, [solver])
 
-    return result.returncode
+    return proc.returncode
 
 
 if __name__ == "__main__":
-    import sys
     sys.exit(main())
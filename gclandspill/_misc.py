@@ -12,6 +12,8 @@ import os
 import sys
 import pathlib
 import argparse
+import operator
+import functools
 import importlib.util
 
 try:
@@ -19,6 +21,13 @@ try:
 except ImportError:  # when python version <= 3.7
     from typing_extensions import TypedDict
 
+try:
+    from math import prod
+except ImportError:  # math.prod is only available since Python 3.8
+    def prod(iterable, *, start=1):
+        """A fallback of math.prod for Python 3.7."""
+        return functools.reduce(operator.mul, iterable, start)
+
 
 class AMRLevelError(Exception):
     """An error to raise when the target AMR level does not exist."""
@@ -47,15 +56,55 @@ class FrictionModelError(Exception):
 
 class DatetimeCtrlParams(TypedDict):
     """A type definition for the `dict` controlling the timestamps."""
-    apply_datetime_stamp = bool
-    datetime_stamp = str
-    calendar_type = str
+    apply_datetime_stamp: bool
+    datetime_stamp: str
+    calendar_type: str
+
+
+def usable_cpus():
+    """Return the number of usable logical CPU cores.
+
+    The CPU affinity (e.g., in containers or on HPC) is respected on platforms supporting it.
+
+    Returns
+    -------
+    An int.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def abs_path(path: os.PathLike):
+    """Return the absolute path after `expanduser` and `resolve`.
+
+    The results are cached, so paths used again and again (e.g., the case folder of batch jobs) are
+    only resolved (and the related file system calls are only done) once per working directory.
+
+    Arguments
+    ---------
+    path : PathLike
+        The path to convert.
+
+    Returns
+    -------
+    A pathlib.Path.
+    """
+    return _resolve(os.getcwd(), os.fspath(path))
+
+
+@functools.lru_cache(maxsize=512)
+def _resolve(cwd: str, path: str):
+    """Resolve a path against `cwd`; cached per working directory and path."""
+    return pathlib.Path(cwd).joinpath(pathlib.Path(path).expanduser()).resolve()
 
 
 def import_setrun(case_dir: os.PathLike):
     """A helper to import setrun.py from a case folder.
 
-    The sys.modules will have a module called `setrun`.
+    The sys.modules will have a module called `setrun`. A setrun.py is only executed the first time
+    it is imported in a process; later calls with the same case folder return the cached module
+    unless the file has been modified since.
 
     Arguments
     ---------
@@ -67,12 +116,21 @@ def import_setrun(case_dir: os.PathLike):
     An imported module.
     """
 
-    setrun_path = pathlib.Path(case_dir).expanduser().resolve().joinpath("setrun.py")
+    setrun_path = abs_path(case_dir).joinpath("setrun.py")
 
     if not setrun_path.is_file():
         raise FileNotFoundError("{} does not exist or is not a file".format(setrun_path))
 
-    spec = importlib.util.spec_from_file_location("setrun", str(setrun_path))
+    setrun = _exec_setrun(str(setrun_path), setrun_path.stat().st_mtime_ns)
+    sys.modules["setrun"] = setrun  # in case another setrun.py was imported in between
+    return setrun
+
+
+@functools.lru_cache(maxsize=None)
+def _exec_setrun(setrun_path: str, mtime_ns: int):  # pylint: disable=unused-argument
+    """Execute a setrun.py and return the module (cached per path and modification time)."""
+
+    spec = importlib.util.spec_from_file_location("setrun", setrun_path)
     setrun = importlib.util.module_from_spec(spec)
     sys.modules["setrun"] = setrun
     spec.loader.exec_module(setrun)
@@ -96,6 +154,13 @@ def check_folder(folder: os.PathLike):
         raise FileNotFoundError("{} does not exist or is not a folder.".format(folder))
 
 
+# string representations of booleans recognized by `str_to_bool`
+_BOOL_MAP = {
+    "true": True, "on": True, "1": True, "yes": True,
+    "false": False, "off": False, "0": False, "no": False,
+}
+
+
 def str_to_bool(value: str):
     """Convert a string to bool.
 
@@ -113,13 +178,10 @@ def str_to_bool(value: str):
     Raise a ValueError if the string is not recognized as a boolean's string representation.
     """
 
-    if value.lower() in ["true", "on", "1", "yes"]:
-        return True
-
-    if value.lower() in ["false", "off", "0", "no"]:
-        return False
-
-    raise ValueError("Not recognized as a bool: {}".format(value))
+    try:
+        return _BOOL_MAP[value.lower()]
+    except KeyError as err:
+        raise ValueError("Not recognized as a bool: {}".format(value)) from err
 
 
 def process_path(path, parent, default):
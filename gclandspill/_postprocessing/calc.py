@@ -9,13 +9,236 @@
 """Post-processing functions calculating something with simulation solutions."""
 import os
 import pathlib
-from typing import Optional, Tuple, Sequence
+import hashlib
+import functools
+import multiprocessing
+import concurrent.futures
+from typing import Optional, Tuple, Sequence, List, NamedTuple, Set
 
+import numpy
 import rasterio
 from gclandspill import pyclaw
 from gclandspill import _misc
 
 
+class PatchData(NamedTuple):
+    """Metadata and solution data of a grid patch returned by `read_frame_patches`."""
+    level: int
+    num_cells: Tuple[int, int]
+    lower: Tuple[float, float]
+    delta: Tuple[float, float]
+    q: Optional[numpy.ndarray]  # shape (num_eqn, num_cells[0], num_cells[1]); no ghost cells
+    aux: Optional[numpy.ndarray] = None  # shape (num_aux, num_cells[0], num_cells[1]); no ghosts
+
+
+def read_frame_patches(
+    soln_dir: os.PathLike, fno: int, read_q: bool = True, read_aux: bool = False
+) -> List[PatchData]:
+    """Read the grid patches of a time frame by memory-mapping the binary solution files.
+
+    Unlike `pyclaw.Solution.read`, the data are not loaded into memory in advance. The `q` (and
+    `aux`) of each returned patch is a view into the memory-mapped `fort.bXXXX` (and `fort.aXXXX`),
+    so only the pages actually used by a caller are read from disk.
+
+    Arguments
+    ---------
+    soln_dir : pathlike
+        Path to where the solution files are.
+    fno : int
+        The frame number.
+    read_q : bool
+        If False, `fort.bXXXX` is not opened, and the `q` of each patch is None. Useful when only
+        the geometry of patches is needed. (default: True)
+    read_aux : bool
+        If True, also map the aux data in `fort.aXXXX`, which must exist. Otherwise, the `aux` of
+        each patch is None. (default: False)
+
+    Returns
+    -------
+    A list of PatchData, in the same order as the patches in the solution files.
+    """
+
+    soln_dir = os.fspath(soln_dir)  # plain strings are cheaper to join in per-frame calls
+
+    # headers of grid patches; each header starts with the grid number
+    headers = []
+    with open(os.path.join(soln_dir, f"fort.q{fno:04d}"), "r") as fileobj:
+        for line in fileobj:
+            if not line.strip():
+                continue
+            val, key = line.split()[:2]
+            if key == "grid_number":
+                headers.append({})
+            headers[-1][key] = val
+
+    patches = [
+        PatchData(
+            level=int(header["AMR_level"]), num_cells=(int(header["mx"]), int(header["my"])),
+            lower=(float(header["xlow"]), float(header["ylow"])),
+            delta=(float(header["dx"]), float(header["dy"])), q=None
+        ) for header in headers
+    ]
+
+    if not (read_q or read_aux) or not patches:
+        return patches
+
+    # frame-wide information, e.g., number of equations and ghost cells
+    with open(os.path.join(soln_dir, f"fort.t{fno:04d}"), "r") as fileobj:
+        info = {line.split()[1]: line.split()[0] for line in fileobj if line.strip()}
+
+    num_ghost = int(info["nghost"])
+
+    # both files store the patches in the same order, each with shape (n_vars, nx+2ng, ny+2ng)
+    files = {}
+    if read_q:
+        files["q"] = (int(info["meqn"]), numpy.memmap(
+            os.path.join(soln_dir, f"fort.b{fno:04d}"), dtype=numpy.float64, mode="r"))
+    if read_aux:
+        files["aux"] = (int(info["naux"]), numpy.memmap(
+            os.path.join(soln_dir, f"fort.a{fno:04d}"), dtype=numpy.float64, mode="r"))
+
+    offset = 0  # the number of cells (including ghost cells) of the previous patches
+    for i, patch in enumerate(patches):
+        n_x, n_y = patch.num_cells
+        shape = (n_x+2*num_ghost, n_y+2*num_ghost)
+        size = shape[0] * shape[1]
+
+        # data of each patch are in Fortran order and include ghost cells
+        views = {}
+        for key, (n_vars, data) in files.items():
+            view = data[offset*n_vars:(offset+size)*n_vars].reshape((n_vars,)+shape, order="F")
+            views[key] = view[:, num_ghost:n_x+num_ghost, num_ghost:n_y+num_ghost]
+        offset += size
+
+        patches[i] = patch._replace(**views)
+
+    return patches
+
+
+def get_aux_frames(soln_dir: os.PathLike) -> Set[int]:
+    """Get the frame numbers having AUX data files (i.e., fort.aXXXX) in a solution folder.
+
+    The folder is scanned only once, so callers looping over frames do not have to check the
+    existence of each AUX file separately.
+
+    Arguments
+    ---------
+    soln_dir : pathlike
+        Path to where the solution files are.
+
+    Returns
+    -------
+    A set of frame numbers.
+    """
+
+    with os.scandir(soln_dir) as entries:
+        return {
+            int(entry.name[6:]) for entry in entries
+            if entry.name.startswith("fort.a") and entry.name[6:].isdigit() and entry.is_file()
+        }
+
+
+class SolnStats(NamedTuple):
+    """Statistics of solutions at an AMR level; see `get_frame_stats` and `get_soln_stats`."""
+    extent: List[float]  # [xmin, ymin, xmax, ymax]; infinite if no patch is at the level
+    res: Optional[Tuple[float, float]]  # (dx, dy); None if no patch is at the level
+    vmin: float  # minimum depth; inf if no patch is at the level
+    vmax: float  # maximum depth; -inf if no patch is at the level
+
+
+def get_frame_stats(fno: int, soln_dir: os.PathLike, level: int):
+    """Get the bounding box, cell size, and min & max depth of a time frame at an AMR level.
+
+    Arguments
+    ---------
+    fno : int
+        The frame number.
+    soln_dir : pathlike
+        Path to where the solution files are.
+    level : int
+        The level of AMR to provess.
+
+    Returns
+    -------
+    A SolnStats.
+    """
+
+    extent = [float("inf"), float("inf"), -float("inf"), -float("inf")]
+    res = None
+    vmin, vmax = float("inf"), -float("inf")
+
+    # search through AMR grid patches in this solution
+    for patch in read_frame_patches(soln_dir, fno):
+        if patch.level != level:
+            continue
+
+        extent[0] = min(extent[0], patch.lower[0])
+        extent[1] = min(extent[1], patch.lower[1])
+        extent[2] = max(extent[2], patch.lower[0]+patch.num_cells[0]*patch.delta[0])
+        extent[3] = max(extent[3], patch.lower[1]+patch.num_cells[1]*patch.delta[1])
+        res = patch.delta
+
+        # reduce the strided depth view in place; no copy of the patch's data is made
+        vmin = min(vmin, float(patch.q[0].min()))
+        vmax = max(vmax, float(patch.q[0].max()))
+
+    return SolnStats(extent, res, vmin, vmax)
+
+
+def get_soln_stats(
+    soln_dir: os.PathLike, frame_bg: int, frame_ed: int, level: int, nprocs: int = 1
+):
+    """Get the bounding box, cell size, and min & max depth of all time frames at an AMR level.
+
+    Each frame is read only once for all the statistics, so callers needing more than one of them
+    should use this function rather than calling `get_soln_extent`, `get_soln_max`, etc. one by one.
+
+    Arguments
+    ---------
+    soln_dir : pathlike
+        Path to where the solution files are.
+    frame_bg, frame_ed : int
+        Begining and end frame numbers.
+    level : int
+        The level of AMR to provess.
+    nprocs : int
+        Number of processes used to read time frames concurrently. (default: 1)
+
+    Returns
+    -------
+    A SolnStats.
+    """
+
+    soln_dir = str(_misc.abs_path(soln_dir))
+    ans = SolnStats([float("inf"), float("inf"), -float("inf"), -float("inf")], None,
+                    float("inf"), -float("inf"))
+
+    worker = functools.partial(get_frame_stats, soln_dir=soln_dir, level=level)
+
+    if nprocs == 1:
+        for fno in range(frame_bg, frame_ed):
+            ans = _merge_stats(ans, worker(fno))
+        return ans
+
+    # the reduction does not depend on the order of frames, so results are merged as they arrive
+    chunksize = max(1, (frame_ed-frame_bg)//(4*nprocs))
+    with multiprocessing.Pool(nprocs) as pool:
+        for stats in pool.imap_unordered(worker, range(frame_bg, frame_ed), chunksize):
+            ans = _merge_stats(ans, stats)
+
+    return ans
+
+
+def _merge_stats(stats_1: SolnStats, stats_2: SolnStats):
+    """Combine the statistics of two sets of time frames."""
+    return SolnStats(
+        [min(stats_1.extent[0], stats_2.extent[0]), min(stats_1.extent[1], stats_2.extent[1]),
+         max(stats_1.extent[2], stats_2.extent[2]), max(stats_1.extent[3], stats_2.extent[3])],
+        stats_1.res if stats_1.res is not None else stats_2.res,
+        min(stats_1.vmin, stats_2.vmin), max(stats_1.vmax, stats_2.vmax)
+    )
+
+
 def get_soln_extent(soln_dir: os.PathLike, frame_bg: int, frame_ed: int, level: int):
     """Get the bounding box of the results of all time frames at a specific AMR level.
 
@@ -34,25 +257,20 @@ def get_soln_extent(soln_dir: os.PathLike, frame_bg: int, frame_ed: int, level:
         [xmin, ymin, xmax, ymax] (i.e., [west, south, east, north])
     """
 
-    soln_dir = pathlib.Path(soln_dir).expanduser().resolve()
+    soln_dir = str(_misc.abs_path(soln_dir))
     extent = [float("inf"), float("inf"), -float("inf"), -float("inf")]
 
     for fno in range(frame_bg, frame_ed):
 
-        # aux and solution file of this time frame
-        aux = soln_dir.joinpath("fort.a"+"{}".format(fno).zfill(4))
-        soln = pyclaw.Solution()
-        soln.read(fno, str(soln_dir), file_format="binary", read_aux=aux.is_file())
-
-        # search through AMR grid patches in this solution
-        for state in soln.states:
-            if state.patch.level != level:
+        # only the headers of patches are needed, so the solution data are not touched
+        for patch in read_frame_patches(soln_dir, fno, False):
+            if patch.level != level:
                 continue
 
-            extent[0] = min(extent[0], state.patch.lower_global[0])
-            extent[1] = min(extent[1], state.patch.lower_global[1])
-            extent[2] = max(extent[2], state.patch.upper_global[0])
-            extent[3] = max(extent[3], state.patch.upper_global[1])
+            extent[0] = min(extent[0], patch.lower[0])
+            extent[1] = min(extent[1], patch.lower[1])
+            extent[2] = max(extent[2], patch.lower[0]+patch.num_cells[0]*patch.delta[0])
+            extent[3] = max(extent[3], patch.lower[1]+patch.num_cells[1]*patch.delta[1])
 
     return extent
 
@@ -75,19 +293,14 @@ def get_soln_res(soln_dir: os.PathLike, frame_bg: int, frame_ed: int, level: int
         Cell size at x and y direction.
     """
 
-    soln_dir = pathlib.Path(soln_dir).expanduser().resolve()
+    soln_dir = str(_misc.abs_path(soln_dir))
 
     for fno in range(frame_bg, frame_ed):
 
-        # aux and solution file of this time frame
-        aux = soln_dir.joinpath("fort.a"+"{}".format(fno).zfill(4))
-        soln = pyclaw.Solution()
-        soln.read(fno, str(soln_dir), file_format="binary", read_aux=aux.is_file())
-
         # search through AMR grid patches, if found desired dx & dy at the level, quit
-        for state in soln.states:
-            if state.patch.level == level:
-                return state.patch.delta
+        for patch in read_frame_patches(soln_dir, fno, False):
+            if patch.level == level:
+                return patch.delta
 
     raise _misc.AMRLevelError("No solutions has AMR level {}".format(level))
 
@@ -108,25 +321,7 @@ def get_soln_min(soln_dir: os.PathLike, frame_bg: int, frame_ed: int, level: int
     -------
     vmin : float
     """
-
-    soln_dir = pathlib.Path(soln_dir).expanduser().resolve()
-    vmin = float("inf")
-
-    for fno in range(frame_bg, frame_ed):
-
-        # aux and solution file of this time frame
-        aux = soln_dir.joinpath("fort.a"+"{}".format(fno).zfill(4))
-        soln = pyclaw.Solution()
-        soln.read(fno, str(soln_dir), file_format="binary", read_aux=aux.is_file())
-
-        # search through AMR grid patches in this solution
-        for state in soln.states:
-            if state.patch.level != level:
-                continue
-
-            vmin = min(vmin, state.q[0].min())
-
-    return vmin
+    return get_soln_stats(soln_dir, frame_bg, frame_ed, level).vmin
 
 
 def get_soln_max(soln_dir: os.PathLike, frame_bg: int, frame_ed: int, level: int):
@@ -145,25 +340,7 @@ def get_soln_max(soln_dir: os.PathLike, frame_bg: int, frame_ed: int, level: int
     -------
     vmax : float
     """
-
-    soln_dir = pathlib.Path(soln_dir).expanduser().resolve()
-    vmax = - float("inf")
-
-    for fno in range(frame_bg, frame_ed):
-
-        # aux and solution file of this time frame
-        aux = soln_dir.joinpath("fort.a"+"{}".format(fno).zfill(4))
-        soln = pyclaw.Solution()
-        soln.read(fno, str(soln_dir), file_format="binary", read_aux=aux.is_file())
-
-        # search through AMR grid patches in this solution
-        for state in soln.states:
-            if state.patch.level != level:
-                continue
-
-            vmax = max(vmax, state.q[0].max())
-
-    return vmax
+    return get_soln_stats(soln_dir, frame_bg, frame_ed, level).vmax
 
 
 def get_topo_min(soln_dir: os.PathLike, frame_bg: int, frame_ed: int, level: int):
@@ -183,26 +360,23 @@ def get_topo_min(soln_dir: os.PathLike, frame_bg: int, frame_ed: int, level: int
     vmin : float
     """
 
-    soln_dir = pathlib.Path(soln_dir).expanduser().resolve()
+    soln_dir = str(_misc.abs_path(soln_dir))
     vmin = float("inf")
+    aux_frames = get_aux_frames(soln_dir)
 
     for fno in range(frame_bg, frame_ed):
 
-        # aux and solution file of this time frame
-        aux = soln_dir.joinpath("fort.a"+"{}".format(fno).zfill(4)).is_file()
-
-        if not aux:  # this time frame does not contain runtime topo data
+        if fno not in aux_frames:  # this time frame does not contain runtime topo data
             continue
 
-        soln = pyclaw.Solution()
-        soln.read(fno, str(soln_dir), file_format="binary", read_aux=True)
-
-        # search through AMR grid patches in this solution
-        for state in soln.states:
-            if state.patch.level != level:
-                continue
+        # search through AMR grid patches in this solution; only the aux data are read from disk
+        vals = [
+            patch.aux[0].min() for patch in read_frame_patches(soln_dir, fno, False, True)
+            if patch.level == level
+        ]
 
-            vmin = min(vmin, state.aux[0].min())
+        if vals:  # one comparison per frame instead of one per patch
+            vmin = min(vmin, min(vals))
 
     if vmin == float("inf"):
         raise _misc.NoFrameDataError("No AUX found in frames {} to {}.".format(frame_bg, frame_ed))
@@ -227,26 +401,23 @@ def get_topo_max(soln_dir: os.PathLike, frame_bg: int, frame_ed: int, level: int
     vmax : float
     """
 
-    soln_dir = pathlib.Path(soln_dir).expanduser().resolve()
+    soln_dir = str(_misc.abs_path(soln_dir))
     vmax = - float("inf")
+    aux_frames = get_aux_frames(soln_dir)
 
     for fno in range(frame_bg, frame_ed):
 
-        # aux and solution file of this time frame
-        aux = soln_dir.joinpath("fort.a"+"{}".format(fno).zfill(4)).is_file()
-
-        if not aux:  # this time frame does not contain runtime topo data
+        if fno not in aux_frames:  # this time frame does not contain runtime topo data
             continue
 
-        soln = pyclaw.Solution()
-        soln.read(fno, str(soln_dir), file_format="binary", read_aux=True)
-
-        # search through AMR grid patches in this solution
-        for state in soln.states:
-            if state.patch.level != level:
-                continue
+        # search through AMR grid patches in this solution; only the aux data are read from disk
+        vals = [
+            patch.aux[0].max() for patch in read_frame_patches(soln_dir, fno, False, True)
+            if patch.level == level
+        ]
 
-            vmax = max(vmax, state.aux[0].max())
+        if vals:  # one comparison per frame instead of one per patch
+            vmax = max(vmax, max(vals))
 
     if vmax == - float("inf"):
         raise _misc.NoFrameDataError("No AUX found in frames {} to {}.".format(frame_bg, frame_ed))
@@ -257,6 +428,10 @@ def get_topo_max(soln_dir: os.PathLike, frame_bg: int, frame_ed: int, level: int
 def get_topo_lims(topo_files: Sequence[os.PathLike], **kwargs):
     """Get the min and max elevation from a set of topography files.
 
+    The results are cached on disk (under `$XDG_CACHE_HOME/gclandspill` or `~/.cache/gclandspill`)
+    and keyed by the paths, sizes, and modification times of the files plus the extent, so repeated
+    runs with the same topography do not decode and merge the rasters again.
+
     Arguments
     ---------
     topo_files : tuple/lsit of pathlike.PathLike
@@ -274,6 +449,21 @@ def get_topo_lims(topo_files: Sequence[os.PathLike], **kwargs):
     # process optional keyword arguments
     extent = None if "extent" not in kwargs else kwargs["extent"]
 
+    # the cache key changes whenever any file is replaced or modified
+    key = hashlib.blake2b(digest_size=16)
+    for topo in sorted(str(pathlib.Path(topo).expanduser().resolve()) for topo in topo_files):
+        stat = os.stat(topo)
+        key.update("{}:{}:{};".format(topo, stat.st_size, stat.st_mtime_ns).encode())
+    key.update("{}".format(None if extent is None else [float(i) for i in extent]).encode())
+
+    cache_file = _get_cache_dir().joinpath("topo_lims", key.hexdigest()+".npy")
+
+    try:
+        vmin, vmax = numpy.load(cache_file)
+        return float(vmin), float(vmax)
+    except (OSError, ValueError):  # not cached yet or a broken cache file
+        pass
+
     # use mosaic raster to obtain interpolated terrain
     rasters = [rasterio.open(topo, "r") for topo in topo_files]
 
@@ -284,7 +474,25 @@ def get_topo_lims(topo_files: Sequence[os.PathLike], **kwargs):
     for topo in rasters:
         topo.close()
 
-    return dst[0].min(), dst[0].max()
+    vmin, vmax = float(dst[0].min()), float(dst[0].max())
+
+    # write to a temporary file first so concurrent runs never see a partially written cache
+    try:
+        os.makedirs(cache_file.parent, exist_ok=True)
+        temp_file = cache_file.with_name("{}.{}.npy".format(cache_file.stem, os.getpid()))
+        numpy.save(temp_file, numpy.array([vmin, vmax]))
+        os.replace(temp_file, cache_file)
+    except OSError:  # caching is only an optimization; e.g., the cache folder may be read-only
+        pass
+
+    return vmin, vmax
+
+
+def _get_cache_dir():
+    """Get the folder of gclandspill's on-disk caches."""
+    return pathlib.Path(
+        os.environ.get("XDG_CACHE_HOME") or pathlib.Path.home().joinpath(".cache")
+    ).joinpath("gclandspill")
 
 
 def interpolate(
@@ -333,23 +541,31 @@ def interpolate(
         "height": None, "width": None, "transform": None,
     }
 
-    memfiles = []  # backend memory files
-    child_rasters = []  # container to hold opened in-memory rasters
-
-    for state in soln.states:
-        if state.patch.level != level:
-            continue  # skip patches not on target level
-
-        child_raster_props["transform"] = rasterio.transform.from_origin(
+    def create(state):
+        """Local function creating an in-memory raster for a patch."""
+        props = dict(child_raster_props)  # each thread needs its own copy
+        props["transform"] = rasterio.transform.from_origin(
             state.patch.lower_global[0], state.patch.upper_global[1],
             state.patch.delta[0], state.patch.delta[1]
         )
-        child_raster_props["height"] = state.patch.num_cells_global[1]
-        child_raster_props["width"] = state.patch.num_cells_global[0]
+        props["height"] = state.patch.num_cells_global[1]
+        props["width"] = state.patch.num_cells_global[0]
+
+        memfile = rasterio.io.MemoryFile()
+        raster = memfile.open(**props)
+        raster.write(state.q[0].T[::-1, :], 1)
+        return memfile, raster
+
+    # skip patches not on target level
+    states = [state for state in soln.states if state.patch.level == level]
+
+    # GDAL releases the GIL when writing, so patches are written to memory files concurrently; each
+    # memory file is only used by one thread; `map` keeps the order of patches for merging
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(8, len(states)))) as executor:
+        results = list(executor.map(create, states))
 
-        memfiles.append(rasterio.io.MemoryFile())
-        child_rasters.append(memfiles[-1].open(**child_raster_props))
-        child_rasters[-1].write(state.q[0].T[::-1, :], 1)
+    memfiles = [memfile for memfile, _ in results]  # backend memory files
+    child_rasters = [raster for _, raster in results]  # opened in-memory rasters
 
     try:
         # make a mosaic raster and interpolate to output domain
@@ -361,8 +577,8 @@ def interpolate(
             raise _misc.NoWetCellError("All grid patches have only dry cells.") from err
         raise  # other unknown errors
 
-    # filter out dry cells
-    dst[dst < dry_tol] = nodata
+    # filter out dry cells (in place)
+    numpy.putmask(dst, dst < dry_tol, nodata)
 
     # close dataset/clear memory
     for memfile, raster in zip(memfiles, child_rasters):
@@ -372,7 +588,9 @@ def interpolate(
     return dst[0], affine
 
 
-def get_total_volume(soln_dir: os.PathLike, frame_bg: int, frame_ed: int, n_levels: int):
+def get_total_volume(
+    soln_dir: os.PathLike, frame_bg: int, frame_ed: int, n_levels: int, nprocs: int = 1
+):
     """Get total volumes at AMR levels.
 
     Arguments
@@ -383,25 +601,59 @@ def get_total_volume(soln_dir: os.PathLike, frame_bg: int, frame_ed: int, n_leve
         Begining and end frame numbers.
     n_levels : int
         Total number of AMR levels.
+    nprocs : int
+        Number of processes used to read and reduce time frames concurrently. (default: 1)
 
     Returns
     -------
-    A list of of shape (n_frames, n_levels).
+    A numpy.ndarray of shape (n_frames, n_levels).
     """
 
-    soln_dir = pathlib.Path(soln_dir).expanduser().resolve()
+    soln_dir = str(_misc.abs_path(soln_dir))
 
-    ans = [[0. for _ in range(n_levels)] for _ in range(frame_bg, frame_ed)]
+    # the output is allocated once; each row is filled by the result of a frame
+    ans = numpy.zeros((max(frame_ed-frame_bg, 0), n_levels), dtype=numpy.float64)
 
-    for ifno, fno in enumerate(range(frame_bg, frame_ed)):
+    # frames are independent, so each one is read and reduced by a worker; `imap` keeps the order
+    worker = functools.partial(get_frame_volume, soln_dir=soln_dir, n_levels=n_levels)
 
-        # solution file of this time frame
-        soln = pyclaw.Solution()
-        soln.read(fno, str(soln_dir), file_format="binary", read_aux=False)
+    if nprocs == 1:
+        for i, fno in enumerate(range(frame_bg, frame_ed)):
+            ans[i] = worker(fno)
+        return ans
 
-        # search through AMR grid patches, if found desired dx & dy at the level, quit
-        for state in soln.states:
-            p = state.patch  # pylint: disable=invalid-name
-            ans[ifno][p.level-1] += (state.q[0].sum() * p.delta[0] * p.delta[1])
+    with multiprocessing.Pool(nprocs) as pool:
+        for i, vols in enumerate(pool.imap(worker, range(frame_bg, frame_ed))):
+            ans[i] = vols
 
     return ans
+
+
+def get_frame_volume(fno: int, soln_dir: os.PathLike, n_levels: int):
+    """Get total volumes at AMR levels of a single time frame.
+
+    Arguments
+    ---------
+    fno : int
+        The frame number.
+    soln_dir : pathlike
+        Path to where the solution files are.
+    n_levels : int
+        Total number of AMR levels.
+
+    Returns
+    -------
+    A numpy.ndarray of shape (n_levels,).
+    """
+
+    patches = read_frame_patches(soln_dir, fno)
+
+    # the volume of each AMR grid patch; only the depth is read from disk
+    vols = numpy.fromiter(
+        (patch.q[0].sum() * patch.delta[0] * patch.delta[1] for patch in patches),
+        dtype=numpy.float64, count=len(patches))
+
+    # accumulate the volumes of patches to their levels
+    levels = numpy.fromiter(
+        (patch.level-1 for patch in patches), dtype=numpy.intp, count=len(patches))
+    return numpy.bincount(levels, weights=vols, minlength=n_levels)
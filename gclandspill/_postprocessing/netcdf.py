@@ -12,7 +12,6 @@ import os
 import sys
 import datetime
 import argparse
-import pathlib
 from typing import Tuple
 
 import numpy
@@ -185,7 +184,8 @@ def write_soln_to_nc(
         The resolution of the output
     nodata : int
         The value indicating a cell being masked.
-    """  # pylint: disable=too-many-arguments
+    """
+    # pylint: disable=too-many-arguments
 
     # open the provided NC file and get the root group
     root = netCDF4.Dataset(  # pylint: disable=no-member
@@ -194,15 +194,12 @@ def write_soln_to_nc(
     print("Frame No. ", end="")
     for band, fno in enumerate(range(frame_bg, frame_ed)):
 
-        print("..{}".format(fno), end="")
+        print(f"..{fno}", end="")
         sys.stdout.flush()
 
-        # determine whether to read aux
-        aux = soln_dir.joinpath("fort.a"+"{}".format(fno).zfill(4)).is_file()
-
-        # read in solution data
+        # read in solution data; only the depth is needed, so skip aux data even if they exist
         soln = pyclaw.Solution()
-        soln.read(fno, str(soln_dir), file_format="binary", read_aux=aux)
+        soln.read(fno, str(soln_dir), file_format="binary", read_aux=False)
 
         # write the time
         root["time"][band] = soln.state.t
@@ -234,7 +231,7 @@ def convert_to_netcdf(args: argparse.Namespace):
     """
 
     # process case path
-    args.case = pathlib.Path(args.case).expanduser().resolve()
+    args.case = _misc.abs_path(args.case)
     _misc.check_folder(args.case)
 
     # process level, frame_ed, dry_tol, and topofiles
@@ -253,15 +250,20 @@ def convert_to_netcdf(args: argparse.Namespace):
         args.filename, args.dest_dir, "{}-depth-lvl{:02}.nc".format(args.case.stem, args.level))
     os.makedirs(args.filename.parent, exist_ok=True)  # make sure the parent folder exists
 
+    # scan solutions only once if both the extent and the resolution are needed
+    if args.extent is None or args.res is None:
+        stats = _postprocessing.calc.get_soln_stats(
+            args.soln_dir, args.frame_bg, args.frame_ed, args.level)
+
     # process args.extent
     if args.extent is None:  # get the minimum extent convering the solutions at all frames
-        args.extent = _postprocessing.calc.get_soln_extent(
-            args.soln_dir, args.frame_bg, args.frame_ed, args.level)
+        args.extent = stats.extent
 
     # process args.res
     if args.res is None:  # get the resolution of the finest AMR grid from solutions
-        args.res = min(_postprocessing.calc.get_soln_res(
-            args.soln_dir, args.frame_bg, args.frame_ed, args.level))
+        if stats.res is None:
+            raise _misc.AMRLevelError("No solutions has AMR level {}".format(args.level))
+        args.res = min(stats.res)
 
     # process args.use_case_settings and timestamp information
     case_settings_file = args.case.joinpath("case_settings.txt")
@@ -8,7 +8,6 @@
 
 """Functions related to plotting depth with matplotlib."""
 import os
-import copy
 import pathlib
 import argparse
 import tempfile
@@ -47,7 +46,7 @@ def plot_depth(args: argparse.Namespace):
     args.nprocs = len(os.sched_getaffinity(0)) if args.nprocs is None else args.nprocs
 
     # process case path
-    args.case = pathlib.Path(args.case).expanduser().resolve()
+    args.case = _misc.abs_path(args.case)
     _misc.check_folder(args.case)
 
     # process level, frame_ed, topofilee, and dry_tol
@@ -67,19 +66,23 @@ def plot_depth(args: argparse.Namespace):
 
     os.makedirs(args.dest_dir, exist_ok=True)  # make sure the folder exists
 
+    # scan solutions only once if both the extent and the max of solution are needed
+    if args.extent is None or args.cmax is None:
+        stats = _postprocessing.calc.get_soln_stats(
+            args.soln_dir, args.frame_bg, args.frame_ed, args.level, args.nprocs)
+
     # process args.extent
     if args.extent is None:  # get the minimum extent convering the solutions at all frames
-        args.extent = _postprocessing.calc.get_soln_extent(
-            args.soln_dir, args.frame_bg, args.frame_ed, args.level)
+        args.extent = stats.extent
 
     # process the max of solution
     if args.cmax is None:
-        args.cmax = _postprocessing.calc.get_soln_max(
-            args.soln_dir, args.frame_bg, args.frame_ed, args.level)
+        args.cmax = stats.vmax
 
-    # prepare args for child processes (also initialize for the first proc)
+    # prepare args for child processes (also initialize for the first proc); children only change
+    # frame_bg and frame_ed, so shallow copies suffice (args are pickled to child processes anyway)
     per_proc = (args.frame_ed - args.frame_bg) // args.nprocs  # number of frames per porcess
-    child_args = [copy.deepcopy(args)]
+    child_args = [argparse.Namespace(**vars(args))]
     child_args[0].frame_bg = args.frame_bg
     child_args[0].frame_ed = args.frame_bg + per_proc
 
@@ -88,7 +91,7 @@ def plot_depth(args: argparse.Namespace):
 
     # remaining processes
     for _ in range(args.nprocs-1):
-        child_args.append(copy.deepcopy(args))
+        child_args.append(argparse.Namespace(**vars(args)))
         child_args[-1].frame_bg = child_args[-2].frame_ed
         child_args[-1].frame_ed = child_args[-1].frame_bg + per_proc
 
@@ -102,7 +105,15 @@ def plot_depth(args: argparse.Namespace):
 
         # change the function arguments
         for i in range(args.nprocs):
-            child_args[i] = [child_args[i], copy.deepcopy(sat_img), copy.deepcopy(sat_extent)]
+            child_args[i] = [child_args[i], sat_img, sat_extent]
+
+    # plot in the current process if only one process is requested (e.g., batch jobs)
+    if args.nprocs == 1:
+        if args.use_sat:
+            plot_soln_frames_on_sat(*child_args[0])
+        else:
+            plot_soln_frames(child_args[0])
+        return 0
 
     # plot
     print("Spawning plotting tasks to {} processes: ".format(args.nprocs))
@@ -141,16 +152,15 @@ def plot_soln_frames(args: argparse.Namespace):
             degs=[args.topo_azdeg, args.topo_altdeg], clims=[args.topo_cmin, args.topo_cmax]
         )
 
+    soln_dir = str(args.soln_dir)  # avoid converting the path in every iteration
+
     for fno in range(args.frame_bg, args.frame_ed):
 
-        print("Processing frame {} by PID {}".format(fno, os.getpid()))
+        print(f"Processing frame {fno} by PID {os.getpid()}")
 
-        # read in solution data
+        # read in solution data; only the depth is plotted, so skip aux data even if they exist
         soln = pyclaw.Solution()
-        soln.read(
-            fno, str(args.soln_dir), file_format="binary",
-            read_aux=args.soln_dir.joinpath("fort.a"+"{}".format(fno).zfill(4)).is_file()
-        )
+        soln.read(fno, soln_dir, file_format="binary", read_aux=False)
 
         axes[0], imgs, cmap_s, cmscale_s = plot_soln_frame_on_ax(
             axes[0], soln, args.level, [args.cmin, args.cmax], args.dry_tol,
@@ -178,6 +188,8 @@ def plot_soln_frames(args: argparse.Namespace):
             except IndexError:
                 break
 
+    matplotlib.pyplot.close(fig)  # the figure may live in a long-running process, e.g., batch jobs
+
     print("PID {} done processing frames {} - {}".format(os.getpid(), args.frame_bg, args.frame_ed))
     return 0
 
@@ -212,16 +224,15 @@ def plot_soln_frames_on_sat(
         extent=[satellite_extent[0], satellite_extent[2], satellite_extent[1], satellite_extent[3]]
     )
 
+    soln_dir = str(args.soln_dir)  # avoid converting the path in every iteration
+
     for fno in range(args.frame_bg, args.frame_ed):
 
-        print("Processing frame {} by PID {}".format(fno, os.getpid()))
+        print(f"Processing frame {fno} by PID {os.getpid()}")
 
-        # read in solution data
+        # read in solution data; only the depth is plotted, so skip aux data even if they exist
         soln = pyclaw.Solution()
-        soln.read(
-            fno, str(args.soln_dir), file_format="binary",
-            read_aux=args.soln_dir.joinpath("fort.a"+"{}".format(fno).zfill(4)).is_file()
-        )
+        soln.read(fno, soln_dir, file_format="binary", read_aux=False)
 
         axes, imgs, _, _ = plot_soln_frame_on_ax(
             axes, soln, args.level, [args.cmin, args.cmax], args.dry_tol,
@@ -242,6 +253,8 @@ def plot_soln_frames_on_sat(
             except IndexError:
                 break
 
+    matplotlib.pyplot.close(fig)  # the figure may live in a long-running process, e.g., batch jobs
+
     print("PID {} done processing frames {} - {}".format(os.getpid(), args.frame_bg, args.frame_ed))
     return 0
 
@@ -8,14 +8,10 @@
 
 """Functions related to plotting runtime topography with matplotlib."""
 import os
-import copy
-import pathlib
 import argparse
 import multiprocessing
 from typing import Tuple
 
-import rasterio
-import rasterio.plot
 import matplotlib.pyplot
 import matplotlib.axes
 import matplotlib.colors
@@ -44,7 +40,7 @@ def plot_topo(args: argparse.Namespace):
     args.nprocs = len(os.sched_getaffinity(0)) if args.nprocs is None else args.nprocs
 
     # process case path
-    args.case = pathlib.Path(args.case).expanduser().resolve()
+    args.case = _misc.abs_path(args.case)
     _misc.check_folder(args.case)
 
     # process level, frame_ed, dry_tol, and topofiles
@@ -69,81 +65,127 @@ def plot_topo(args: argparse.Namespace):
     args.cmin = lims[0] if args.cmin is None else args.cmin
     args.cmax = lims[1] if args.cmax is None else args.cmax
 
-    # prepare args for child processes (also initialize for the first proc)
-    per_proc = (args.frame_ed - args.frame_bg) // args.nprocs  # number of frames per porcess
-    child_args = [copy.deepcopy(args)]
-    child_args[0].frame_bg = args.frame_bg
-    child_args[0].frame_ed = args.frame_bg + per_proc
+    # frames have different numbers of patches, so each frame is a task to balance the workload
+    chunksize = max(1, (args.frame_ed-args.frame_bg)//(4*args.nprocs))
 
-    # the first process has to do more jobs ...
-    child_args[0].frame_ed += (args.frame_ed - args.frame_bg) % args.nprocs
-
-    # remaining processes
-    for _ in range(args.nprocs-1):
-        child_args.append(copy.deepcopy(args))
-        child_args[-1].frame_bg = child_args[-2].frame_ed
-        child_args[-1].frame_ed = child_args[-1].frame_bg + per_proc
+    # plot in the current process if only one process is requested (e.g., batch jobs)
+    if args.nprocs == 1:
+        return plot_aux_frames(args)
 
     # plot
     print("Spawning plotting tasks to {} processes: ".format(args.nprocs))
-    with multiprocessing.Pool(args.nprocs, lambda: print("PID {}".format(os.getpid()))) as pool:
-        pool.map(plot_aux_frames, child_args)
+    with multiprocessing.Pool(args.nprocs, _init_aux_worker, (args,)) as pool:
+        frames = range(args.frame_bg, args.frame_ed)
+        for i, _ in enumerate(pool.imap_unordered(plot_aux_frame, frames, chunksize), 1):
+            print("Done processing {} of {} frames".format(i, len(frames)), flush=True)
 
     return 0
 
 
-def plot_aux_frames(args: argparse.Namespace):
-    """Plot aux frames.
+# states of the current plotting process shared by all frames it plots; see `_init_aux_worker`
+_WORKER = {}
+
 
-    Currently, this function is supposed to be called by `plot_depth` with multiprocessing.
+def _init_aux_worker(args: argparse.Namespace):
+    """Initialize the figure and other states used by `plot_aux_frame` in the current process.
 
     Argumenst
     ---------
     args : argparse.Namespace
         CMD argument parsed by `argparse`.
+    """
+
+    print("PID {}".format(os.getpid()))
+
+    # plot
+    fig, axes = matplotlib.pyplot.subplots(1, 2, gridspec_kw={"width_ratios": [10, 1]})
+
+    # the colormap limits are the same for all frames, so the colorbar is only created once
+    fig.colorbar(
+        matplotlib.cm.ScalarMappable(
+            matplotlib.colors.Normalize(args.cmin, args.cmax, False), args.cmap),
+        cax=axes[1])
+
+    _WORKER["args"] = args
+    _WORKER["fig"], _WORKER["axes"] = fig, axes
+    _WORKER["images"] = []  # image artists reused by all frames
+
+    # frames having aux data; scan the folder once instead of checking files frame by frame
+    _WORKER["aux_frames"] = _postprocessing.calc.get_aux_frames(args.soln_dir)
+    _WORKER["soln_dir"] = str(args.soln_dir)  # avoid converting the path for every frame
+
+
+def plot_aux_frame(fno: int):
+    """Plot an aux frame.
+
+    Currently, this function is supposed to be called by `plot_topo` with multiprocessing, and
+    `_init_aux_worker` must have been called in the same process.
+
+    Argumenst
+    ---------
+    fno : int
+        The frame number.
 
     Returns
     -------
     Execution code. 0 for success.
     """
 
-    # plot
-    fig, axes = matplotlib.pyplot.subplots(1, 2, gridspec_kw={"width_ratios": [10, 1]})
+    args, fig, axes = _WORKER["args"], _WORKER["fig"], _WORKER["axes"]
 
-    for fno in range(args.frame_bg, args.frame_ed):
+    # flush, so the message shows up right away even if a worker's stdout is a pipe
+    print(f"Processing frame {fno} by PID {os.getpid()}", flush=True)
 
-        print("Processing frame {} by PID {}".format(fno, os.getpid()))
+    # no aux data for this frame
+    if fno not in _WORKER["aux_frames"]:
+        return 0
 
-        aux = args.soln_dir.joinpath("fort.a"+"{}".format(fno).zfill(4)).is_file()
+    # read in solution data
+    soln = pyclaw.Solution()
+    soln.read(fno, _WORKER["soln_dir"], file_format="binary", read_aux=True)
+
+    axes[0], imgs, _, _ = plot_aux_frame_on_ax(
+        axes[0], soln, [args.cmin, args.cmax], args.level, cmap=args.cmap, border=args.border,
+        images=_WORKER["images"])
+
+    axes[0].set_xlim(args.extent[0], args.extent[2])
+    axes[0].set_ylim(args.extent[1], args.extent[3])
+
+    fig.suptitle("T = {} sec".format(soln.state.t))  # title
+    fig.savefig(args.dest_dir.joinpath("frame{:05d}.png".format(fno)))  # save
+
+    # clear artists (except the reusable images)
+    while True:
+        try:
+            img = imgs.pop()
+            img.remove()
+            del img
+        except IndexError:
+            break
+
+    return 0
 
-        # no aux data for this frame
-        if not aux:
-            continue
 
-        # read in solution data
-        soln = pyclaw.Solution()
-        soln.read(fno, str(args.soln_dir), file_format="binary", read_aux=True)
+def plot_aux_frames(args: argparse.Namespace):
+    """Plot aux frames from `args.frame_bg` to `args.frame_ed` in the current process.
 
-        axes[0], imgs, cmap, cmscale = plot_aux_frame_on_ax(
-            axes[0], soln, [args.cmin, args.cmax], args.level, cmap=args.cmap, border=args.border)
+    Argumenst
+    ---------
+    args : argparse.Namespace
+        CMD argument parsed by `argparse`.
 
-        axes[0].set_xlim(args.extent[0], args.extent[2])
-        axes[0].set_ylim(args.extent[1], args.extent[3])
+    Returns
+    -------
+    Execution code. 0 for success.
+    """
 
-        # topography colorbar
-        fig.colorbar(matplotlib.cm.ScalarMappable(cmscale, cmap), cax=axes[1])
+    _init_aux_worker(args)
 
-        fig.suptitle("T = {} sec".format(soln.state.t))  # title
-        fig.savefig(args.dest_dir.joinpath("frame{:05d}.png".format(fno)))  # save
+    for fno in range(args.frame_bg, args.frame_ed):
+        plot_aux_frame(fno)
 
-        # clear artists
-        while True:
-            try:
-                img = imgs.pop()
-                img.remove()
-                del img
-            except IndexError:
-                break
+    matplotlib.pyplot.close(_WORKER["fig"])  # the figure may live in a long-running process
+    _WORKER.clear()
 
     print("PID {} done processing frames {} - {}".format(os.getpid(), args.frame_bg, args.frame_ed))
     return 0
@@ -174,13 +216,17 @@ def plot_aux_frame_on_ax(
             Colormap to use. (Default: viridis)
         border : bool
             To draw border line for each patch.
+        images : list of matplotlib.image.AxesImage
+            Image artists to be reused for patches, e.g., those from the previous frame. New images
+            are appended to it if it is not long enough, and unused ones are hidden. If not
+            provided, new images are always created and returned in `imgs`.
 
     Returns
     -------
     axes : matplotlib.axes.Axes
         The updated Axes object.
     imgs : matplotlib.image.AxesImage
-        Thes artist objects created by this function.
+        Thes artist objects created by this function (excluding those in `images`).
     cmap : matplotlib.colors.Colormap
         The colormap object used by the solutions.
     cmscale : matplotlib.colors.Normalize
@@ -189,11 +235,17 @@ def plot_aux_frame_on_ax(
 
     # process optional keyword arguments
     cmap = "viridis" if "cmap" not in kwargs else kwargs["cmap"]
+    images = None if "images" not in kwargs else kwargs["images"]
 
     # normalization object
     cmscale = matplotlib.colors.Normalize(*clims, False)
 
+    # border line styles of each AMR level, so they are not created again for every patch
+    greys = matplotlib.cm.get_cmap("Greys")
+    stls = [{"color": greys(lvl/max_lv), "lw": 1, "alpha": 0.7} for lvl in range(max_lv+1)]
+
     imgs = []
+    n_images = 0  # number of images in `images` used so far
     for state in soln.states:
 
         p = state.patch  # pylint: disable=invalid-name
@@ -201,20 +253,32 @@ def plot_aux_frame_on_ax(
         if p.level > max_lv:  # skip AMR level greater than sprcified level
             continue
 
-        affine = rasterio.transform.from_origin(
-            p.lower_global[0], p.upper_global[1], p.delta[0], p.delta[1])
+        # the extent of the patch in the format of (left, right, bottom, top) used by imshow
+        extent = (p.lower_global[0], p.upper_global[0], p.lower_global[1], p.upper_global[1])
 
         dst = state.aux[0].T[::-1, :]
-        imgs.append(axes.imshow(
-            dst, cmap=cmap, extent=rasterio.plot.plotting_extent(dst, affine), norm=cmscale,
-        ))
+
+        if images is None:
+            imgs.append(axes.imshow(dst, cmap=cmap, extent=extent, norm=cmscale))
+        elif n_images < len(images):  # update an existing image instead of creating a new one
+            images[n_images].set_data(dst)
+            images[n_images].set_extent(extent)
+            images[n_images].set_visible(True)
+            n_images += 1
+        else:
+            images.append(axes.imshow(dst, cmap=cmap, extent=extent, norm=cmscale))
+            n_images += 1
 
         # boarder line
-        stl = {"color": matplotlib.cm.get_cmap("Greys")(p.level/max_lv), "lw": 1, "alpha": 0.7}
+        stl = stls[p.level]
         if "border" in kwargs and kwargs["border"]:
             imgs.append(axes.hlines(p.lower_global[1], p.lower_global[0], p.upper_global[0], **stl))
             imgs.append(axes.hlines(p.upper_global[1], p.lower_global[0], p.upper_global[0], **stl))
             imgs.append(axes.vlines(p.lower_global[0], p.lower_global[1], p.upper_global[1], **stl))
             imgs.append(axes.vlines(p.upper_global[0], p.lower_global[1], p.upper_global[1], **stl))
 
+    # hide reusable images not needed by this solution
+    for img in ([] if images is None else images[n_images:]):
+        img.set_visible(False)
+
     return axes, imgs, cmap, cmscale
@@ -9,7 +9,6 @@
 """Calculate total volumes to check mass conservation."""
 import os
 import argparse
-import pathlib
 
 from gclandspill import _misc
 from gclandspill import _postprocessing
@@ -18,8 +17,12 @@ from gclandspill import _postprocessing
 def create_volume_csv(args: argparse.Namespace):
     """Calculate total volumes to check mass conservation."""
 
+    # process nprocs; Python API callers may not set it at all
+    args.nprocs = getattr(args, "nprocs", None)
+    args.nprocs = _misc.usable_cpus() if args.nprocs is None else args.nprocs
+
     # process case path
-    args.case = pathlib.Path(args.case).expanduser().resolve()
+    args.case = _misc.abs_path(args.case)
     _misc.check_folder(args.case)
 
     # manually add a key `level` with value None, so we can get max AMR level from the next function
@@ -40,15 +43,17 @@ def create_volume_csv(args: argparse.Namespace):
     args.filename = _misc.process_path(args.filename, args.dest_dir, "volumes.csv")
     os.makedirs(args.filename.parent, exist_ok=True)  # make sure the parent folder exists
 
-    # get volume data with shape (n_levels, n_frames)
-    data = _postprocessing.calc.get_total_volume(args.soln_dir, args.frame_bg, args.frame_ed, args.level)
+    # get volume data with shape (n_frames, n_levels)
+    data = _postprocessing.calc.get_total_volume(
+        args.soln_dir, args.frame_bg, args.frame_ed, args.level, args.nprocs)
 
+    # the first column is the frame number; floats are written with Python's shortest round-trip
+    # representation (e.g., 0.0 and 1.5238739454696168e-06), which keeps the full precision
     with open(args.filename, "w") as fileobj:
-        line = "frame" + ",level {}" * args.level + "\n"
-        fileobj.write(line.format(*list(range(1, args.level+1))))
-
-        for ifno, fno in enumerate(range(args.frame_bg, args.frame_ed)):
-            line = "{}" + ",{}" * args.level + "\n"
-            fileobj.write(line.format(fno, *data[ifno]))
+        fileobj.write(("frame" + ",level {}" * args.level + "\n").format(*range(1, args.level+1)))
+        fileobj.writelines(
+            "{},{}\n".format(fno, ",".join(map(repr, row)))
+            for fno, row in zip(range(args.frame_bg, args.frame_ed), data.tolist())
+        )
 
     return 0
@@ -11,20 +11,48 @@
 
 import os
 import time
+import logging
 import pathlib
+import threading
+import contextlib
 import shutil
 import glob
+import functools
+import concurrent.futures
 from typing import Tuple
 
-import urllib3
-import requests
 import numpy
 import rasterio
 import rasterio.features
+import rasterio.shutil
 import rasterio.transform
 from gclandspill import _misc
 from gclandspill import clawutil
 
+try:
+    import orjson as _json
+except ImportError:  # orjson is optional; fall back to the standard library
+    import json as _json
+
+
+# REST endpoints of the NHD layers: flowline, area, and waterbody
+_NHD_SERVERS = (
+    "https://hydro.nationalmap.gov/arcgis/rest/services/nhd/MapServer/6/query",
+    "https://hydro.nationalmap.gov/arcgis/rest/services/nhd/MapServer/8/query",
+    "https://hydro.nationalmap.gov/arcgis/rest/services/nhd/MapServer/10/query",
+)
+
+# query parameters shared by all NHD requests; `where` and `geometry` are added per request
+_NHD_QUERY = {
+    "f": "geojson",
+    "geometryType": "esriGeometryEnvelope",
+    "inSR": "3857",
+    "spatialRel": "esriSpatialRelIntersects",
+    "returnGeometry": "true",
+    "outSR": "3857",
+    "orderByFields": "OBJECTID",  # a stable order, so paging with resultOffset is consistent
+}
+
 
 def create_data(
     case_dir: os.PathLike, log_level: int = None,
@@ -47,7 +75,7 @@ def create_data(
     """
 
     # let pathlib handle path-related stuff
-    case_dir = pathlib.Path(case_dir).expanduser().resolve()
+    case_dir = _misc.abs_path(case_dir)
 
     if not case_dir.is_dir():
         raise FileNotFoundError("{} does not exist or is not a folder".format(case_dir))
@@ -85,15 +113,25 @@ def create_data(
     # create the folder regardless
     os.makedirs(out_dir)
 
-    # move *.data to the true output folder
+    # move *.data to the true output folder; a plain rename unless the folders are on different
+    # file systems, in which case shutil copies the file (with sendfile on Linux) and deletes it
     for data_file in data_files:
-        shutil.move(data_file, out_dir)
+        dst = out_dir.joinpath(os.path.basename(data_file))
+        try:
+            os.replace(data_file, dst)
+        except OSError:
+            shutil.move(data_file, dst)
 
-    # check if topo file exists. Download it if not exist
-    check_download_topo(case_dir, rundata)
+    # check if topo and hydro files exist and download them if not; both are mostly waiting for
+    # the servers, so do them concurrently
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(check_download_topo, case_dir, rundata),
+            executor.submit(check_download_hydro, case_dir, rundata)
+        ]
 
-    # check if hudro file exists. Download it if not exist
-    check_download_hydro(case_dir, rundata)
+    for future in futures:
+        future.result()  # re-raise exceptions, if any
 
 
 def check_download_topo(case_dir: os.PathLike, rundata: clawutil.data.ClawRunData):
@@ -108,27 +146,10 @@ def check_download_topo(case_dir: os.PathLike, rundata: clawutil.data.ClawRunDat
     """
 
     # let pathlib handle paht-related stuff
-    case_dir = pathlib.Path(case_dir).expanduser().resolve()
-
-    # calculate extend and resolution required by the setrun.py
-    ext = [rundata.clawdata.lower[0], rundata.clawdata.lower[1],
-           rundata.clawdata.upper[0], rundata.clawdata.upper[1]]
+    case_dir = _misc.abs_path(case_dir)
 
-    n_x = rundata.clawdata.num_cells[0]
-    for i in range(rundata.amrdata.amr_levels_max-1):
-        n_x *= rundata.amrdata.refinement_ratios_x[i]
-
-    n_y = rundata.clawdata.num_cells[1]
-    for i in range(rundata.amrdata.amr_levels_max-1):
-        n_y *= rundata.amrdata.refinement_ratios_y[i]
-
-    res = min((ext[2]-ext[0])/n_x, (ext[3]-ext[1])/n_y)
-
-    # make the extent of the topo file a little bit larger than comp. domain
-    ext[0] -= res
-    ext[1] -= res
-    ext[2] += res
-    ext[3] += res
+    # extent and resolution required by the setrun.py
+    ext, res = _compute_ext_res(rundata)
 
     # to indicate we've already download the topo once
     downloaded = None
@@ -207,7 +228,7 @@ def check_download_hydro(case_dir: os.PathLike, rundata: clawutil.data.ClawRunDa
     if not rundata.landspill_data.hydro_features.files:
         return
 
-    case_dir = pathlib.Path(case_dir).expanduser().resolve()
+    case_dir = _misc.abs_path(case_dir)
 
     if os.path.isabs(rundata.landspill_data.hydro_features.files[0]):
         hydro_file = pathlib.Path(rundata.landspill_data.hydro_features.files[0])
@@ -220,34 +241,55 @@ def check_download_hydro(case_dir: os.PathLike, rundata: clawutil.data.ClawRunDa
 
     print("Hydro file {} not found. ".format(hydro_file) + "Download it now.")
 
+    # extent and resolution required by the setrun.py
+    ext, res = _compute_ext_res(rundata)
+
+    os.makedirs(hydro_file.parent, exist_ok=True)
+
+    print("Obtaining GeoJson from NHD high resolution dataset server.")
+    feats = obtain_NHD_geojson(ext)
+
+    print("Write GeoJson data to raster file {}".format(hydro_file))
+    convert_geojson_2_raster(feats, hydro_file, ext, res)
+
+    print("Done writing to {}".format(hydro_file))
+
+
+def _compute_ext_res(rundata: clawutil.data.ClawRunData):
+    """Calculate the extent and resolution of downloaded data required by a setrun.py.
+
+    The resolution is that of the finest AMR level, and the extent is the computational domain
+    extended by one cell on each side.
+
+    Arguments
+    ---------
+    rundata : ClawRunData
+        An instance of `ClawRunData`.
+
+    Returns
+    -------
+    ext : list
+        The extent in the format of [x_min, y_min, x_max, y_max].
+    res : float
+        The resolution.
+    """
+
     ext = [rundata.clawdata.lower[0], rundata.clawdata.lower[1],
            rundata.clawdata.upper[0], rundata.clawdata.upper[1]]
 
-    n_x = rundata.clawdata.num_cells[0]
-    for i in range(rundata.amrdata.amr_levels_max-1):
-        n_x *= rundata.amrdata.refinement_ratios_x[i]
-
-    n_y = rundata.clawdata.num_cells[1]
-    for i in range(rundata.amrdata.amr_levels_max-1):
-        n_y *= rundata.amrdata.refinement_ratios_y[i]
+    n_lvls = rundata.amrdata.amr_levels_max - 1
+    n_x = rundata.clawdata.num_cells[0] * _misc.prod(rundata.amrdata.refinement_ratios_x[:n_lvls])
+    n_y = rundata.clawdata.num_cells[1] * _misc.prod(rundata.amrdata.refinement_ratios_y[:n_lvls])
 
     res = min((ext[2]-ext[0])/n_x, (ext[3]-ext[1])/n_y)
 
-    # make the extent of the hydro file a little bit larger than comp. domain
+    # make the extent a little bit larger than comp. domain
     ext[0] -= res
     ext[1] -= res
     ext[2] += res
     ext[3] += res
 
-    os.makedirs(hydro_file.parent, exist_ok=True)
-
-    print("Obtaining GeoJson from NHD high resolution dataset server.")
-    feats = obtain_NHD_geojson(ext)
-
-    print("Write GeoJson data to raster file {}".format(hydro_file))
-    convert_geojson_2_raster(feats, hydro_file, ext, res)
-
-    print("Done writing to {}".format(hydro_file))
+    return ext, res
 
 
 def request_arcgis_token(
@@ -262,6 +304,9 @@ def request_arcgis_token(
     Return: a str, the token.
     """
 
+    # pylint: disable=import-outside-toplevel
+    import requests  # network libraries are only imported when really downloading something
+
     # information that will post to token server to obtain a token
     token_applicant = {
         "f": "json",
@@ -284,7 +329,7 @@ def request_arcgis_token(
     return token
 
 
-def obtain_geotiff(extent, filename, res=1, source="3DEP", token=None):
+def obtain_geotiff(extent, filename, res=1, source="3DEP", token=None, pixel_type="F32"):
     """Grab the GeoTiff file for the elevation of a region.
 
     The region is defined by the argument extent. extent is a list with 4
@@ -301,7 +346,11 @@ def obtain_geotiff(extent, filename, res=1, source="3DEP", token=None):
         res [in]: output resolution. Default: 1 meter.
         source [in]: either 3DEP or ESRI.
         token [in]: if using ESRI source, the token must be provided.
+        pixel_type [in]: the pixel type of the GeoTiff, e.g., F32 or S16. An
+            integer type halves the download size but truncates elevations to
+            whole meters. Default: F32.
     """
+    # pylint: disable=too-many-arguments
 
     # the REST endpoint of exportImage of the elevation server
     if source == "ESRI":
@@ -335,7 +384,7 @@ def obtain_geotiff(extent, filename, res=1, source="3DEP", token=None):
         "imageSR": "3857",
         "bboxSr": "3857",
         "format": "tiff",
-        "pixelType": "F32",
+        "pixelType": pixel_type,
         "noData": "-9999",
         "interpolation": "RSP_BilinearInterpolation",
     }
@@ -347,21 +396,15 @@ def obtain_geotiff(extent, filename, res=1, source="3DEP", token=None):
         dem_query["mosaicRule"] = \
             "{\"mosaicMethod\":\"esriMosaicAttribute\",\"sortField\":\"AcquisitionDate\"}"
 
-    # create a HTTP session that can retry 5 times if 500, 502, 503, 504 happens
-    session = requests.Session()
-    session.mount("https://", requests.adapters.HTTPAdapter(
-        max_retries=urllib3.util.retry.Retry(
-            total=5, backoff_factor=1, status_forcelist=[500, 502, 503, 504])))
+    # pylint: disable=import-outside-toplevel
+    import requests  # network libraries are only imported when really downloading something
 
     # use GET to get response
-    dem_response = session.get(dem_server, stream=True, params=dem_query)
+    dem_response = _get_session().get(dem_server, stream=True, params=dem_query)
 
     # try to raise an error if the server does not return success signal
     dem_response.raise_for_status()
 
-    # close the session
-    session.close()
-
     # if execution comes to this point, we've got the GeoTiff from the server
     tif_url = dem_response.json()["href"]
 
@@ -374,118 +417,100 @@ def obtain_geotiff(extent, filename, res=1, source="3DEP", token=None):
         if rspnd.status_code == requests.codes.ok:  # pylint: disable=no-member
             break
 
+        rspnd.close()  # release the connection before retrying
         time.sleep(3)
         count += 3
         if count > 300:
             rspnd.raise_for_status()
 
-    with open(os.path.abspath(filename), "wb") as file_obj:
-        file_obj.write(rspnd.content)
+    # stream the file to disk chunk by chunk, so a large GeoTiff is never held in memory
+    with rspnd, open(os.path.abspath(filename), "wb") as file_obj:
+        for chunk in rspnd.iter_content(chunk_size=1024*1024):
+            file_obj.write(chunk)
 
 
 def geotiff_2_esri_ascii(in_file, out_file):
     """Convert a GeoTiff to an ESRI ASCII file."""
 
-    geotiff = rasterio.open(in_file, "r")
-
-    # a workaround to ignore ERROR 4 message; we create a new Tiff and close it
-    rasterio.open(
-        os.path.abspath(out_file), mode="w", driver="GTiff",
-        width=1, height=1, count=1, crs=rasterio.crs.CRS.from_epsg(3857),
-        transform=geotiff.transform, dtype=rasterio.int8, nodata=0
-    ).close()
+    # let GDAL copy the raster directly instead of going through a numpy array; the GeoTiff blocks
+    # are decompressed with all CPU cores, and no *.aux.xml sidecar file is created
+    with rasterio.Env(GDAL_NUM_THREADS="ALL_CPUS", GDAL_PAM_ENABLED="NO"):
+        rasterio.shutil.copy(os.path.abspath(in_file), os.path.abspath(out_file), driver="AAIGrid")
 
-    dst = rasterio.open(
-        os.path.abspath(out_file), mode="w", driver="AAIGrid",
-        width=geotiff.width, height=geotiff.height, count=geotiff.count,
-        crs=rasterio.crs.CRS.from_epsg(3857),
-        transform=geotiff.transform, dtype=rasterio.float32,
-        nodata=geotiff.nodata)
 
-    dst.write_band(1, geotiff.read(1))
-    dst.close()
-
-    geotiff.close()
+def obtain_NHD_geojson(extent, fcodes=None):  # pylint: disable=invalid-name
+    """Obtain features from NHD high resolution dataset MapServer
 
+    If the server truncates a response, the remaining features are requested page by page.
 
-def obtain_NHD_geojson(extent):  # pylint: disable=invalid-name
-    """Obtain features from NHD high resolution dataset MapServer
+    Arguments:
+        extent: a list of [xmin, ymin, xmax, ymax]
+            The bound of the domain in EPSG 3857.
+        fcodes: a list of int or None
+            Only request features having these NHD FCodes. (default: None, i.e., all features)
 
     Retrun:
         A list: [<flowline>, <area>, <water body>]. The data types are GeoJson.
     """
 
-    servers = []
-
-    # flowline
-    servers.append(
-        "https://hydro.nationalmap.gov/arcgis/rest/services/nhd/MapServer/6/query")
-
-    # area
-    servers.append(
-        "https://hydro.nationalmap.gov/arcgis/rest/services/nhd/MapServer/8/query")
-
-    # waterbody
-    servers.append(
-        "https://hydro.nationalmap.gov/arcgis/rest/services/nhd/MapServer/10/query")
-
-    queries = []
-
-    # flowline
-    queries.append({
-        "where": "1=1",  # in the future, use this to filter FCode(s)
-        "f": "geojson",
-        "geometry": "{},{},{},{}".format(extent[0], extent[1], extent[2], extent[3]),
-        "geometryType": "esriGeometryEnvelope",
-        "inSR": "3857",
-        "spatialRel": "esriSpatialRelIntersects",
-        "returnGeometry": "true",
-        "outSR": "3857"
-    })
-
-    # area
-    queries.append({
-        "where": "1=1",  # in the future, use this to filter FCode(s)
-        "f": "geojson",
-        "geometry": "{},{},{},{}".format(extent[0], extent[1], extent[2], extent[3]),
-        "geometryType": "esriGeometryEnvelope",
-        "inSR": "3857",
-        "spatialRel": "esriSpatialRelIntersects",
-        "returnGeometry": "true",
-        "outSR": "3857"
-    })
-
-    # waterbody
-    queries.append({
-        "where": "1=1",  # in the future, use this to filter FCode(s)
-        "f": "geojson",
-        "geometry": "{},{},{},{}".format(extent[0], extent[1], extent[2], extent[3]),
-        "geometryType": "esriGeometryEnvelope",
-        "inSR": "3857",
-        "spatialRel": "esriSpatialRelIntersects",
-        "returnGeometry": "true",
-        "outSR": "3857"
-    })
-
-    geoms = []
+    # all layers are queried with the same parameters; requests does not mutate `params`
+    query = dict(
+        _NHD_QUERY,
+        where="1=1" if fcodes is None else "FCODE IN ({})".format(",".join(map(str, fcodes))),
+        geometry="{},{},{},{}".format(extent[0], extent[1], extent[2], extent[3]))
 
-    session = requests.Session()
-    session.mount("https://", requests.adapters.HTTPAdapter(
-        max_retries=urllib3.util.retry.Retry(
-            total=5, backoff_factor=1, status_forcelist=[500, 502, 503, 504])))
+    session = _get_session()
+
+    def fetch(server):
+        """Local function to send the query to a layer and return the GeoJson response."""
+        features = []
+        while True:
+            with session.get(server, params=dict(query, resultOffset=len(features))) as response:
+                response.raise_for_status()
+                page = _json.loads(response.content)  # parse raw bytes; no decoded str copy
+            features.extend(page["features"])
+
+            # the flag may be at the top level or in the properties of the FeatureCollection
+            truncated = page.get("exceededTransferLimit", False) or \
+                page.get("properties", {}).get("exceededTransferLimit", False)
+
+            if not truncated or not page["features"]:
+                break
 
-    for i, server in enumerate(servers):
-        response = session.get(server, stream=True, params=queries[i])
-        response.raise_for_status()
-        geoms.append(response.json())
+        page["features"] = features
+        return page
 
-    session.close()
+    # the layers are independent, so query them concurrently; `map` keeps the order of layers
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(_NHD_SERVERS)) as executor:
+        geoms = list(executor.map(fetch, _NHD_SERVERS))
 
     return geoms
 
 
-def convert_geojson_2_raster(feat_layers, filename, extent, res, crs=3857):
-    """Convert a list of GeoTiff dict to raster (ESRI ASCII files)."""
+def convert_geojson_2_raster(
+    feat_layers, filename, extent, res, crs=3857, all_touched_lines=True, all_touched_polys=False
+):
+    """Convert a list of GeoTiff dict to raster (ESRI ASCII files).
+
+    Arguments
+    ---------
+    feat_layers : a list of GeoJson dict
+        The feature layers returned by `obtain_NHD_geojson`.
+    filename : PathLike
+        The output ESRI ASCII file.
+    extent : a list of [xmin, ymin, xmax, ymax]
+        The bound of the raster.
+    res : float
+        The resolution of the raster.
+    crs : int
+        The EPSG code of the CRS. Only 3857 is supported now.
+    all_touched_lines, all_touched_polys : bool
+        Whether to burn all pixels touched by line features (e.g., flowlines) and by polygon
+        features (e.g., areas and water bodies), or only those whose centers are inside the
+        features. Burning touched pixels keeps thin flowlines connected but would enlarge polygons
+        by up to one cell on every side. (default: True for lines and False for polygons)
+    """
+    # pylint: disable=too-many-arguments
 
     if crs != 3857:
         raise NotImplementedError("crs other than 3857 are not implemented yet")
@@ -494,38 +519,89 @@ def convert_geojson_2_raster(feat_layers, filename, extent, res, crs=3857):
     height = int((extent[3]-extent[1])/res+0.5)
     transform = rasterio.transform.from_origin(extent[0], extent[3], res, res)
 
-    shapes = []
+    # validate geometries and separate 1D features from 2D ones
+    lines, polys = [], []
     for feat_layer in feat_layers:
         for geo in feat_layer["features"]:
             if not rasterio.features.is_valid_geom(geo["geometry"]):
                 raise ValueError("Not a valid GeoJson gemoetry data")
-            shapes.append((geo["geometry"], 10))
-
-    # if no geometry exists in the list
-    if not shapes:
-        image = numpy.ones((height, width), dtype=rasterio.float32) * -9999.
-    # else if there's any geometry
+            if geo["geometry"]["type"] in ["LineString", "MultiLineString"]:
+                lines.append((geo["geometry"], 10))
+            else:
+                polys.append((geo["geometry"], 10))
+
+    # burn lines and polygons in one pass if they use the same rule, otherwise one pass per type
+    if all_touched_lines == all_touched_polys:
+        groups = [(lines + polys, all_touched_lines)]
     else:
-        image = rasterio.features.rasterize(
-            shapes=shapes, out_shape=(width, height), fill=-9999.,
-            transform=transform, all_touched=True, dtype=rasterio.float32)
+        groups = [(lines, all_touched_lines), (polys, all_touched_polys)]
+
+    # the shape of the raster is (n_rows, n_cols); pixels without geometries remain -9999
+    image = numpy.full((height, width), -9999., dtype=rasterio.float32)
+
+    for shapes, all_touched in groups:
+        if shapes:
+            rasterio.features.rasterize(
+                shapes=shapes, out=image, transform=transform, all_touched=all_touched)
 
-    # a workaround to ignore ERROR 4 message
-    rasterio.open(
-        os.path.abspath(filename), mode="w", driver="GTiff",
-        width=1, height=1, count=1, crs=rasterio.crs.CRS.from_epsg(3857),
-        transform=transform, dtype=rasterio.int8, nodata=0
-    ).close()
+    _write_esri_ascii(filename, image, transform, -9999., crs)
 
-    dst = rasterio.open(
-        os.path.abspath(filename), mode="w", driver="AAIGrid",
-        width=width, height=height, count=1,
-        crs=rasterio.crs.CRS.from_epsg(crs), transform=transform,
-        dtype=rasterio.float32, nodata=-9999.)
 
-    dst.write(image, indexes=1)
+class _ThreadMuteFilter(logging.Filter):
+    """A logging filter dropping non-critical records emitted by threads inside `muted()`.
+
+    Unlike changing a logger's level, muting only affects the calling thread, so other threads
+    (e.g., the concurrent topography and hydrology downloads) still get their messages logged.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._local = threading.local()
 
-    dst.close()
+    def filter(self, record):
+        return record.levelno >= logging.CRITICAL or not getattr(self._local, "muted", False)
+
+    @contextlib.contextmanager
+    def muted(self):
+        """Mute non-critical records emitted by the calling thread within the context."""
+        self._local.muted = True
+        try:
+            yield
+        finally:
+            self._local.muted = False
+
+
+# GDAL reports a harmless "ERROR 4" when an output file does not exist yet; `_write_esri_ascii`
+# uses this filter to mute it
+_RASTERIO_ENV_FILTER = _ThreadMuteFilter()
+logging.getLogger("rasterio._env").addFilter(_RASTERIO_ENV_FILTER)
+
+
+def _write_esri_ascii(filename, image, transform, nodata, crs=3857):
+    """Write a 2D array to a single-band ESRI ASCII file.
+
+    Arguments
+    ---------
+    filename : PathLike
+        The output ESRI ASCII file.
+    image : numpy.ndarray
+        The raster values with a shape of (n_rows, n_cols).
+    transform : affine.Affine
+        The affine transform of the raster.
+    nodata : float
+        The nodata value.
+    crs : int
+        The EPSG code of the CRS.
+    """
+
+    with _RASTERIO_ENV_FILTER.muted():
+        with rasterio.open(
+            os.path.abspath(filename), mode="w", driver="AAIGrid",
+            width=image.shape[1], height=image.shape[0], count=1,
+            crs=rasterio.crs.CRS.from_epsg(crs), transform=transform,
+            dtype=rasterio.float32, nodata=nodata
+        ) as dst:
+            dst.write(image.astype(rasterio.float32, copy=False), indexes=1)
 
 
 def download_satellite_image(extent, filepath, force=False):
@@ -578,13 +654,7 @@ def download_satellite_image(extent, filepath, force=False):
         "f": "json"
     }
 
-    # create a HTTP session that can retry 5 times if 500, 502, 503, 504 happens
-    session = requests.Session()
-    session.mount("https://", requests.adapters.HTTPAdapter(
-        max_retries=requests.packages.urllib3.util.retry.Retry(  # pylint: disable=no-member
-            total=5, backoff_factor=1, status_forcelist=[500, 502, 503, 504]
-        )
-    ))
+    session = _get_session()
 
     # use GET to get response
     respns = session.get(api_url, params=params)
@@ -599,9 +669,6 @@ def download_satellite_image(extent, filepath, force=False):
     with open(filepath, "wb") as fileobj:
         fileobj.write(respns2.content)
 
-    # close the session
-    session.close()
-
     # write image extent to a text file
     with open(extent_file, "w") as fileobj:
         fileobj.write("{} {} {} {}".format(
@@ -611,3 +678,30 @@ def download_satellite_image(extent, filepath, force=False):
 
     return [respns["extent"]["xmin"], respns["extent"]["ymin"],
             respns["extent"]["xmax"], respns["extent"]["ymax"]]
+
+
+@functools.lru_cache(maxsize=1)
+def _get_session():
+    """Get the HTTP session shared by all downloads in this process.
+
+    The session retries 5 times if 500, 502, 503, or 504 happens, and keeps connections to the
+    servers alive between requests.
+
+    Returns
+    -------
+    A requests.Session.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    import urllib3  # network libraries are only imported when really downloading something
+    import requests
+
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=16, pool_maxsize=16,
+        max_retries=urllib3.util.retry.Retry(
+            total=5, backoff_factor=1, status_forcelist=[500, 502, 503, 504]))
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
@@ -10,7 +10,11 @@
 """Classes representing parameters for geoclaw-landspill runs.
 """
 import os
-from functools import reduce as _reduce
+import pathlib
+from copy import deepcopy as _deepcopy
+from numbers import Real as _Real
+from functools import lru_cache as _lru_cache
+import numpy as _numpy
 from gclandspill import clawutil as _clawutil
 from gclandspill import _misc
 
@@ -61,6 +65,57 @@ class ClawRunData(_clawutil.data.ClawRunData):
         self.refinement_data.variable_dt_refinement_ratios = True
     """
 
+    # default values different from those of the original GeoClaw, applied by `__init__`
+    _DEFAULTS = {
+        # core classical clawpack configuration
+        "clawdata": {
+            "num_eqn": 3,
+            "num_waves": 3,
+            "num_aux": 2,
+            "output_format": 3,  # binary
+            "output_aux_components": "all",
+            "output_aux_onlyonce": False,
+            "dt_initial": None,
+            "dt_max": 5.0,
+            "cfl_max": 0.95,
+            "steps_max": 100000,
+            "verbosity": 5,
+            "verbosity_regrid": 5,
+            "source_split": 1,  # godunov
+            "limiter": [4, 4, 4],  # use "mc" limiter for all equations
+            "use_fwaves": True,
+            "bc_lower": [1, 1],
+            "bc_upper": [1, 1],
+        },
+
+        # AMRClaw configuration
+        "amrdata": {
+            "amr_levels_max": 2,
+            "refinement_ratios_x": [4],
+            "refinement_ratios_y": [4],
+            "refinement_ratios_t": [4],
+            "aux_type": ["center", "center"],  # aux variables are defined at cell centers
+            "regrid_interval": 1,
+            "verbosity_regrid": 5,
+        },
+
+        # GeoClaw basic configuration
+        "geo_data": {
+            "gravity": 9.81,
+            "coriolis_forcing": False,
+            "sea_level": -1000.,
+            "dry_tolerance": 1e-4,
+            "friction_forcing": False,  # turned off in favor of Darcy-Weisbach friction
+        },
+
+        # GeoClaw refinement mechanism
+        "refinement_data": {
+            "wave_tolerance": 1.0e-5,
+            "speed_tolerance": [1e-5] * 6,
+            "variable_dt_refinement_ratios": True,
+        },
+    }
+
     def __init__(self):
         # pylint: disable=no-member
         super().__init__("geoclaw", 2)  # to first get attributes from geoclaw and with dimension 2
@@ -72,45 +127,11 @@ class ClawRunData(_clawutil.data.ClawRunData):
         # append a landspill data instance to the data object
         self.add_data(LandSpillData(), 'landspill_data')
 
-        # core classical clawpack configuration
-        self.clawdata.num_eqn = 3
-        self.clawdata.num_waves = 3
-        self.clawdata.num_aux = 2
-        self.clawdata.output_format = 3  # binary
-        self.clawdata.output_aux_components = "all"
-        self.clawdata.output_aux_onlyonce = False
-        self.clawdata.dt_initial = None
-        self.clawdata.dt_max = 5.0
-        self.clawdata.cfl_max = 0.95
-        self.clawdata.steps_max = 100000
-        self.clawdata.verbosity = 5
-        self.clawdata.verbosity_regrid = 5
-        self.clawdata.source_split = 1  # godunov
-        self.clawdata.limiter = [4, 4, 4]  # use "mc" limiter for all equations
-        self.clawdata.use_fwaves = True
-        self.clawdata.bc_lower = [1, 1]
-        self.clawdata.bc_upper = [1, 1]
-
-        # AMRClaw configuration
-        self.amrdata.amr_levels_max = 2
-        self.amrdata.refinement_ratios_x = [4]
-        self.amrdata.refinement_ratios_y = [4]
-        self.amrdata.refinement_ratios_t = [4]
-        self.amrdata.aux_type = ["center", "center"]  # aux variables are defined at cell centers
-        self.amrdata.regrid_interval = 1
-        self.amrdata.verbosity_regrid = 5
-
-        # GeoClaw basic configuration
-        self.geo_data.gravity = 9.81
-        self.geo_data.coriolis_forcing = False
-        self.geo_data.sea_level = -1000.
-        self.geo_data.dry_tolerance = 1e-4
-        self.geo_data.friction_forcing = False  # turned off in favor of Darcy-Weisbach friction
-
-        # GeoClaw refinement mechanism
-        self.refinement_data.wave_tolerance = 1.0e-5
-        self.refinement_data.speed_tolerance = [1e-5] * 6
-        self.refinement_data.variable_dt_refinement_ratios = True
+        # modify default values of the clawpack data objects; copied so instances never share lists
+        for name, defaults in self._DEFAULTS.items():
+            data = getattr(self, name)
+            for key, val in defaults.items():
+                setattr(data, key, _deepcopy(val))
 
     def write(self, out_dir=""):
         """Write out the data file to the path given"""
@@ -127,17 +148,14 @@ class ClawRunData(_clawutil.data.ClawRunData):
         # automatically determine dt_initial
         if self.clawdata.dt_initial is None:
             if self.landspill_data.point_sources.n_point_sources > 0:
-                cell_area = \
-                    (self.clawdata.upper[0] - self.clawdata.lower[0]) * \
-                    (self.clawdata.upper[1] - self.clawdata.lower[1]) / \
-                    (self.clawdata.num_cells[0] * self.clawdata.num_cells[1])
-                cell_area /= _reduce(
-                    lambda x, y: x*y, self.amrdata.refinement_ratios_x[:self.amrdata.amr_levels_max], 1)
-                cell_area /= _reduce(
-                    lambda x, y: x*y, self.amrdata.refinement_ratios_y[:self.amrdata.amr_levels_max], 1)
-                vrate = self.landspill_data.point_sources.point_sources[0][-1][0]
-
-                self.clawdata.dt_initial = 0.3 * cell_area / vrate
+                levels = self.amrdata.amr_levels_max
+                self.clawdata.dt_initial = _compute_dt_initial(
+                    tuple(self.clawdata.lower), tuple(self.clawdata.upper),
+                    tuple(self.clawdata.num_cells),
+                    tuple(self.amrdata.refinement_ratios_x[:levels]),
+                    tuple(self.amrdata.refinement_ratios_y[:levels]),
+                    self.landspill_data.point_sources.point_sources[0][-1][0]
+                )
             else:
                 self.clawdata.dt_initial = 1e-5
 
@@ -154,6 +172,29 @@ class ClawRunData(_clawutil.data.ClawRunData):
             self.landspill_data.darcy_weisbach_friction.friction_tol = self.geo_data.friction_depth
 
 
+@_lru_cache(maxsize=None)
+def _compute_dt_initial(lower, upper, num_cells, ratios_x, ratios_y, vrate):
+    """Estimate the initial time step from the finest cell area and the first point source's rate.
+
+    All arguments must be hashable (i.e., tuples instead of lists) so the results are memoized for
+    runs sharing the same domain and AMR settings, e.g., parameter sweeps in a setrun script.
+    """
+    cell_area = (upper[0] - lower[0]) * (upper[1] - lower[1]) / (num_cells[0] * num_cells[1])
+    cell_area /= _misc.prod(r_x * r_y for r_x, r_y in zip(ratios_x, ratios_y))  # one pass over levels
+    return 0.3 * cell_area / vrate
+
+
+# descriptions of the parameters in landspill.data
+_DESC_REF_MU = "Reference dynamic viscosity (mPa-s)"
+_DESC_REF_TEMPERATURE = "Reference temperature for temperature-dependent viscosity (Celsius)"
+_DESC_AMBIENT_TEMPERATURE = "Ambient temperature (Celsius)"
+_DESC_DENSITY = "Density at ambient temperature (kg/m^3"
+_DESC_POINT_SOURCES_FILE = "File name of point sources settings"
+_DESC_DARCY_WEISBACH_FILE = "File name of Darcy-Weisbach settings"
+_DESC_HYDRO_FEATURE_FILE = "File name of hydrological feature settings"
+_DESC_EVAPORATION_FILE = "File name of evaporation settings"
+
+
 # Land-spill data
 class LandSpillData(_clawutil.data.ClawData):
     """Data object describing land spill simulation configurations"""
@@ -199,20 +240,19 @@ class LandSpillData(_clawutil.data.ClawData):
         """Write out the data file to the path given"""
 
         # to make sure child data files are written to the same folder
-        base = os.path.dirname(out_file)
+        base = pathlib.Path(out_file).parent
 
         # open the output file
         self.open_data_file(out_file, data_source)
 
         self.data_write('ref_mu',
-                        description='Reference dynamic viscosity (mPa-s)')
+                        description=_DESC_REF_MU)
         self.data_write('ref_temperature',
-                        description='Reference temperature for \
-                            temperature-dependent viscosity (Celsius)')
+                        description=_DESC_REF_TEMPERATURE)
         self.data_write('ambient_temperature',
-                        description='Ambient temperature (Celsius)')
+                        description=_DESC_AMBIENT_TEMPERATURE)
         self.data_write('density',
-                        description='Density at ambient temperature (kg/m^3')
+                        description=_DESC_DENSITY)
 
         # tolerance to control mesh refinement specifically to landspill applications
         self.data_write("update_tol")
@@ -220,28 +260,39 @@ class LandSpillData(_clawutil.data.ClawData):
 
         # output point sources data
         self.data_write('point_sources_file',
-                        description='File name of point sources settings')
-        self.point_sources.write(os.path.join(base, self.point_sources_file))  # pylint: disable=no-member
+                        description=_DESC_POINT_SOURCES_FILE)
+        self.point_sources.write(str(base / self.point_sources_file))  # pylint: disable=no-member
 
         # output Darcy-Weisbach data
         self.data_write('darcy_weisbach_file',
-                        description='File name of Darcy-Weisbach settings')
-        self.darcy_weisbach_friction.write(os.path.join(base, self.darcy_weisbach_file))  # pylint: disable=no-member
+                        description=_DESC_DARCY_WEISBACH_FILE)
+        self.darcy_weisbach_friction.write(  # pylint: disable=no-member
+            str(base / self.darcy_weisbach_file))
 
         # output hydroological feature data
         self.data_write('hydro_feature_file',
-                        description='File name of hydrological feature settings')
-        self.hydro_features.write(os.path.join(base, self.hydro_feature_file))  # pylint: disable=no-member
+                        description=_DESC_HYDRO_FEATURE_FILE)
+        self.hydro_features.write(str(base / self.hydro_feature_file))  # pylint: disable=no-member
 
         # output evaporation data
         self.data_write('evaporation_file',
-                        description='File name of evaporation settings')
-        self.evaporation.write(os.path.join(base, self.evaporation_file))  # pylint: disable=no-member
+                        description=_DESC_EVAPORATION_FILE)
+        self.evaporation.write(str(base / self.evaporation_file))  # pylint: disable=no-member
 
         # close the output file
         self.close_data_file()
 
 
+# descriptions of the parameters in point_source.data; the records of each point source are
+# written in a loop and share the same descriptions
+_DESC_N_POINT_SOURCES = "Number of point sources"
+_DESC_PTS_ID = "ID of this point source"
+_DESC_PTS_COORD = "coordinates"
+_DESC_PTS_N_TIMES = "number of time segments"
+_DESC_PTS_END_TIMES = "end times of segments"
+_DESC_PTS_VOL_RATES = "volumetric rates of segments"
+
+
 # Point source data
 class PointSourceData(_clawutil.data.ClawData):
     """Data object describing point sources"""
@@ -267,16 +318,16 @@ class PointSourceData(_clawutil.data.ClawData):
         self.open_data_file(out_file, data_source)
 
         # write number of point sources
-        self.data_write('n_point_sources', description='Number of point sources')
+        self.data_write('n_point_sources', description=_DESC_N_POINT_SOURCES)
 
         # write point sources
         for i, pts in enumerate(self.point_sources):  # pylint: disable=no-member
             self.data_write()  # a blank line
-            self.data_write("id", i, description="ID of this point source")
-            self.data_write("coord", pts[0], description="coordinates")
-            self.data_write("n_times", pts[1], description="number of time segments")
-            self.data_write("end_times", pts[2], description="end times of segments")
-            self.data_write("vol_rates", pts[3], description="volumetric rates of segments")
+            self.data_write("id", i, description=_DESC_PTS_ID)
+            self.data_write("coord", pts[0], description=_DESC_PTS_COORD)
+            self.data_write("n_times", pts[1], description=_DESC_PTS_N_TIMES)
+            self.data_write("end_times", pts[2], description=_DESC_PTS_END_TIMES)
+            self.data_write("vol_rates", pts[3], description=_DESC_PTS_VOL_RATES)
 
         # close the output file
         self.close_data_file()
@@ -293,25 +344,41 @@ class PointSourceData(_clawutil.data.ClawData):
         for i, pts in enumerate(self.point_sources):
             assert len(pts) == 4, "There should be 4 records in the data of " \
                 "the {}-th point source.".format(i)
-            assert isinstance(pts[0], list), "The coordinate of the {}-th " \
-                "point source is not a Python list.".format(i)
+            assert isinstance(pts[0], list) and isinstance(pts[1], int) and \
+                isinstance(pts[2], list) and isinstance(pts[3], list), "The records of the " \
+                "{}-th point source should be in the format of [list, int, list, list], i.e., " \
+                "[coordinate, number of time segments, end times, volumetric rates].".format(i)
             assert len(pts[0]) == 2, "The coordinate of the {}-th point " \
                 "is not in the format of [x, y].".format(i)
-            assert isinstance(pts[1], int), "The 2nd record in the data of " \
-                "the {}-th point source should be an integer for the number " \
-                "of time segments.".format(i)
-            assert isinstance(pts[2], list), "The end times of the time segments " \
-                "of the {}-th point source is not a Python list.".format(i)
-            assert len(pts[2]) == pts[1], "The number of end times does not " \
+            assert all(isinstance(t, _Real) for t in pts[2]), "The end times of the {}-th " \
+                "point source should be numbers.".format(i)
+            end_times = _numpy.asarray(pts[2], dtype=float)
+            assert end_times.size == pts[1], "The number of end times does not " \
                 "match the integer provided for the {}-th point source.".format(i)
-            assert sorted(pts[2]) == pts[2], "The list of end times is not " \
-                "sorted in an ascending order."
-            assert isinstance(pts[3], list), "The volumetric rates of the time " \
-                "segments of the {}-th point source is not a Python list.".format(i)
+            assert _numpy.all(_numpy.diff(end_times) >= 0.), "The list of end times " \
+                "of the {}-th point source is not sorted in an ascending order.".format(i)
             assert len(pts[3]) == pts[1], "The number of volumetric rates does " \
                 "not match the integer provided for the {}-th point source.".format(i)
 
 
+# descriptions of the parameters in darcy_weisbach.data
+_DESC_DW_TYPE = "Type of Darcy-Weisbach coefficient"
+_DESC_DW_FRICTION_TOL = "Same meanining as the friction_depth in original GeoClaw setting."
+_DESC_DW_DRY_TOL = "Same meaning as the dry_tolerance in original GeoClaw setting."
+_DESC_DW_COEFFICIENT = "Darcy-Weisbach coefficient"
+_DESC_DW_BLOCK_DEFAULT = "coefficient for uncovered areas"
+_DESC_DW_N_BLOCKS = "number of blocks"
+_DESC_DW_XLOWERS = "x lower coords for blocks"
+_DESC_DW_XUPPERS = "x upper coords for blocks"
+_DESC_DW_YLOWERS = "y lower coords for blocks"
+_DESC_DW_YUPPERS = "y upper coords for blocks"
+_DESC_DW_COEFFICIENTS = "coefficients in blocks"
+_DESC_DW_COEFFICIENT_FILE = "Escri ASCII file for coefficients"
+_DESC_DW_DEFAULT_COEFFICIENT = "coefficient for cells not covered by the file"
+_DESC_DW_ROUGHNESS_FILE = "Escri ASCII file for roughness"
+_DESC_DW_DEFAULT_ROUGHNESS = "roughness for cells not covered by the file"
+
+
 # Darcy-Weisbach data
 class DarcyWeisbachData(_clawutil.data.ClawData):
     """Data object describing Darcy-Weisbach friction model"""
@@ -368,57 +435,29 @@ class DarcyWeisbachData(_clawutil.data.ClawData):
         # check data consistency
         self._check()
 
-        # process the absolute path to the filename (even though it's not used in type 1 & 2)
-        # Relative path will be relative to the folder containing `out_file` (following how geoclaw
-        # handles topo files)
-        if not os.path.isabs(self.filename):
-            self.filename = os.path.abspath(os.path.join(os.path.dirname(out_file), self.filename))
-
         # open the output file
         self.open_data_file(out_file, data_source)
 
         # write number of point sources
-        self.data_write('type', description='Type of Darcy-Weisbach coefficient')
+        self.data_write('type', description=_DESC_DW_TYPE)
 
         # if this deature is disabled, close the file and return
         if self.type == 0:
             self.close_data_file()
             return
 
+        # process the absolute path to the filename (even though it's not used in type 1 & 2)
+        # Relative path will be relative to the folder containing `out_file` (following how geoclaw
+        # handles topo files)
+        if not os.path.isabs(self.filename):
+            self.filename = os.path.abspath(os.path.join(os.path.dirname(out_file), self.filename))
+
         # for other non-zero options
-        self.data_write('friction_tol', description='Same meanining as the ' +
-                        'friction_depth in original GeoClaw setting.')
-        self.data_write('dry_tol', description='Same meaning as the ' +
-                        'dry_tolerance in original GeoClaw setting.')
-
-        if self.type == 1:
-            self.data_write('coefficient',
-                            description="Darcy-Weisbach coefficient")
-        elif self.type == 2:
-            self.data_write('default_coefficient',
-                            description="coefficient for uncovered areas")
-            self.data_write('n_blocks',
-                            description="number of blocks")
-            self.data_write('xlowers',
-                            description="x lower coords for blocks")
-            self.data_write('xuppers',
-                            description="x upper coords for blocks")
-            self.data_write('ylowers',
-                            description="x lower coords for blocks")
-            self.data_write('yuppers',
-                            description="x upper coords for blocks")
-            self.data_write('coefficients',
-                            description="coefficients in blocks")
-        elif self.type == 3:
-            self.data_write('filename',
-                            description="Escri ASCII file for coefficients")
-            self.data_write('default_coefficient',
-                            description="coefficient for cells not covered by the file")
-        elif self.type in [4, 5, 6]:
-            self.data_write('filename',
-                            description="Escri ASCII file for roughness")
-            self.data_write('default_roughness',
-                            description="roughness for cells not covered by the file")
+        self.data_write('friction_tol', description=_DESC_DW_FRICTION_TOL)
+        self.data_write('dry_tol', description=_DESC_DW_DRY_TOL)
+
+        # type-specific parameters (`_check` already guarantees the type is valid)
+        self._WRITERS[self.type](self)
 
         # close the output file
         self.close_data_file()
@@ -433,53 +472,108 @@ class DarcyWeisbachData(_clawutil.data.ClawData):
         if self.type == 0:
             return
 
+        if self.type not in self._CHECKERS:
+            raise ValueError("Type values outside [0, 6] not allowed.")
+
         # common data for non-zero options
         assert isinstance(self.friction_tol, float), \
             "friction_tol shoudl be a floating number."
         assert isinstance(self.dry_tol, float), \
             "dry_toll shoudl be a floating number."
 
-        # non-zero options
-        if self.type == 1:
-            assert isinstance(self.default_coefficient, float), \
-                "default_coefficient shoudl be a floating number."
-        elif self.type == 2:
-            assert isinstance(self.n_blocks, int), \
-                "n_blocks shoudl be a floating number."
-            assert isinstance(self.xlowers, list), \
-                "xlowers shoudl be a list."
-            assert len(self.xlowers) == self.n_blocks, \
-                "the length of xlowers shoudl be n_blocks."
-            assert isinstance(self.xuppers, list), \
-                "xuppers shoudl be a list."
-            assert len(self.xuppers) == self.n_blocks, \
-                "the length of xuppers shoudl be n_blocks."
-            assert isinstance(self.ylowers, list), \
-                "ylowers shoudl be a list."
-            assert len(self.ylowers) == self.n_blocks, \
-                "the length of ylowers shoudl be n_blocks."
-            assert isinstance(self.yuppers, list), \
-                "yuppers shoudl be a list."
-            assert len(self.yuppers) == self.n_blocks, \
-                "the length of yuppers shoudl be n_blocks."
-            assert isinstance(self.coefficients, list), \
-                "coefficients shoudl be a list."
-            assert len(self.coefficients) == self.n_blocks, \
-                "the length of coefficients shoudl be n_blocks."
-        elif self.type in [3, 4, 5, 6]:
-            assert isinstance(self.filename, str), \
-                "filename should be a string."
-            assert self.filename != "", \
-                "filename can not be empty."
-
-            if self.type == 3:
-                assert isinstance(self.default_coefficient, float), \
-                    "default_coefficient shoudl be a float"
-            else:
-                assert isinstance(self.default_roughness, float), \
-                    "default_roughness shoudl be a float"
-        else:
-            raise ValueError("Type values outside [0, 5] not allowed.")
+        # type-specific parameters
+        self._CHECKERS[self.type](self)
+
+    def _write_constant(self):
+        """Write parameters of type 1."""
+        self.data_write('coefficient',
+                        description=_DESC_DW_COEFFICIENT)
+
+    def _write_blocks(self):
+        """Write parameters of type 2."""
+        self.data_write('default_coefficient',
+                        description=_DESC_DW_BLOCK_DEFAULT)
+        self.data_write('n_blocks',
+                        description=_DESC_DW_N_BLOCKS)
+        self.data_write('xlowers',
+                        description=_DESC_DW_XLOWERS)
+        self.data_write('xuppers',
+                        description=_DESC_DW_XUPPERS)
+        self.data_write('ylowers',
+                        description=_DESC_DW_YLOWERS)
+        self.data_write('yuppers',
+                        description=_DESC_DW_YUPPERS)
+        self.data_write('coefficients',
+                        description=_DESC_DW_COEFFICIENTS)
+
+    def _write_coefficient_file(self):
+        """Write parameters of type 3."""
+        self.data_write('filename',
+                        description=_DESC_DW_COEFFICIENT_FILE)
+        self.data_write('default_coefficient',
+                        description=_DESC_DW_DEFAULT_COEFFICIENT)
+
+    def _write_roughness_file(self):
+        """Write parameters of type 4, 5, and 6."""
+        self.data_write('filename',
+                        description=_DESC_DW_ROUGHNESS_FILE)
+        self.data_write('default_roughness',
+                        description=_DESC_DW_DEFAULT_ROUGHNESS)
+
+    def _check_constant(self):
+        """Check parameters of type 1."""
+        # pylint: disable=no-member
+        assert isinstance(self.default_coefficient, float), \
+            "default_coefficient shoudl be a floating number."
+
+    def _check_blocks(self):
+        """Check parameters of type 2."""
+        # pylint: disable=no-member
+        assert isinstance(self.n_blocks, int), \
+            "n_blocks shoudl be an integer."
+        assert isinstance(self.xlowers, list) and isinstance(self.xuppers, list) and \
+            isinstance(self.ylowers, list) and isinstance(self.yuppers, list) and \
+            isinstance(self.coefficients, list), \
+            "xlowers, xuppers, ylowers, yuppers, and coefficients shoudl be lists."
+        assert len(self.xlowers) == len(self.xuppers) == len(self.ylowers) == \
+            len(self.yuppers) == len(self.coefficients) == self.n_blocks, \
+            "the lengths of xlowers, xuppers, ylowers, yuppers, and coefficients shoudl be " + \
+            "n_blocks."
+
+    def _check_coefficient_file(self):
+        """Check parameters of type 3."""
+        # pylint: disable=no-member
+        assert isinstance(self.filename, str), \
+            "filename should be a string."
+        assert self.filename != "", \
+            "filename can not be empty."
+        assert isinstance(self.default_coefficient, float), \
+            "default_coefficient shoudl be a float"
+
+    def _check_roughness_file(self):
+        """Check parameters of type 4, 5, and 6."""
+        # pylint: disable=no-member
+        assert isinstance(self.filename, str), \
+            "filename should be a string."
+        assert self.filename != "", \
+            "filename can not be empty."
+        assert isinstance(self.default_roughness, float), \
+            "default_roughness shoudl be a float"
+
+    # type-specific writers and checkers for non-zero types
+    _WRITERS = {
+        1: _write_constant, 2: _write_blocks, 3: _write_coefficient_file,
+        4: _write_roughness_file, 5: _write_roughness_file, 6: _write_roughness_file,
+    }
+
+    _CHECKERS = {
+        1: _check_constant, 2: _check_blocks, 3: _check_coefficient_file,
+        4: _check_roughness_file, 5: _check_roughness_file, 6: _check_roughness_file,
+    }
+
+
+# descriptions of the parameters in hydro_feature.data
+_DESC_N_HYDRO_FILES = "Number of hydro files"
 
 
 # Hydrologic feature data
@@ -502,20 +596,29 @@ class HydroFeatureData(_clawutil.data.ClawData):
 
         # write number of files
         self.data_write('n_files', len(self.files),  # pylint: disable=no-member
-                        description='Number of hydro files')
+                        description=_DESC_N_HYDRO_FILES)
+
+        # relative path will be relative to the folder containing `out_file` (following how
+        # geoclaw handles topo files)
+        base = pathlib.Path(out_file).parent
 
         # write file names line by line
         for i, single_file in enumerate(self.files):  # pylint: disable=no-member
-            # relative path will be relative to the folder containing `out_file` (following how
-            # geoclaw handles topo files)
-            if not os.path.isabs(single_file):
-                single_file = os.path.abspath(os.path.join(os.path.dirname(out_file), single_file))
-            self.data_write('file {0}'.format(i), single_file)
+            single_file = pathlib.Path(single_file)
+            if not single_file.is_absolute():
+                single_file = base.joinpath(single_file).resolve()
+            self.data_write('file {0}'.format(i), str(single_file))
 
         # close the output file
         self.close_data_file()
 
 
+# descriptions of the parameters in evaporation.data
+_DESC_EVAP_TYPE = "Evaporation type"
+_DESC_EVAP_N_COEFFICIENTS = "Number of evaporation coefficients."
+_DESC_EVAP_COEFFICIENT = "Coefficient {}"
+
+
 # Evaporation data
 class EvaporationData(_clawutil.data.ClawData):
     """Data object describing evaporation"""
@@ -544,15 +647,15 @@ class EvaporationData(_clawutil.data.ClawData):
         self.open_data_file(out_file, data_source)
 
         # write model type
-        self.data_write('type', description='Evaporation type')
+        self.data_write('type', description=_DESC_EVAP_TYPE)
 
         # number of coefficients
         self.data_write('n_coefficients', len(self.coefficients),  # pylint: disable=no-member
-                        description='Number of evaporation coefficients.')
+                        description=_DESC_EVAP_N_COEFFICIENTS)
 
         for i, coeff in enumerate(self.coefficients):  # pylint: disable=no-member
             self.data_write('C{}'.format(i), coeff,
-                            description='Coefficient {}'.format(i))
+                            description=_DESC_EVAP_COEFFICIENT.format(i))
 
         # close the output file
         self.close_data_file()
@@ -9,6 +9,7 @@
 """Test the main function.
 """
 import sys
+import json
 import subprocess
 import pytest
 import gclandspill
@@ -62,3 +63,35 @@ def test_volumes_help():
     """Test volumes --help."""
     sys.argv = ["geoclaw-landspill", "volumes", "--help"]
     call_main()
+
+
+def test_batch_help():
+    """Test batch --help."""
+    sys.argv = ["geoclaw-landspill", "batch", "--help"]
+    call_main()
+
+
+def test_clawpack_alias_keeps_spec():
+    """Test importing through the clawpack alias doesn't replace the module's own spec."""
+    import clawpack.pyclaw  # pylint: disable=import-outside-toplevel
+    assert clawpack.pyclaw is gclandspill.pyclaw
+    assert gclandspill.pyclaw.__spec__.name == "gclandspill.pyclaw"
+    assert gclandspill.__spec__.name == "gclandspill"
+
+
+@pytest.mark.parametrize("jobs", [
+    [["run", "case-1"]],  # `run` is not allowed in a manifest
+    [["volumes", "case-1"], ["plotdepht", "case-2"]],  # a typo in the second job
+    [["volumes", "case-1"], []],  # an empty job
+    ["volumes case-1"],  # a job that is not a list
+    {"volumes": "case-1"},  # a manifest that is not a list
+])
+def test_batch_malformed_manifest(tmp_path, jobs):
+    """Test a malformed manifest is rejected before any job runs."""
+    manifest = tmp_path.joinpath("manifest.json")
+    with open(manifest, "w") as fileobj:
+        json.dump(jobs, fileobj)
+
+    sys.argv = ["geoclaw-landspill", "batch", str(manifest)]
+    with pytest.raises(ValueError):
+        gclandspill.__main__.main()
@@ -0,0 +1,44 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+# vim:fenc=utf-8
+#
+# Copyright © 2021 Pi-Yueh Chuang <pychuang@gwu.edu>
+#
+# Distributed under terms of the BSD 3-Clause license.
+
+"""Test pre-processing functions.
+"""
+import numpy
+import rasterio
+import pytest
+import gclandspill._preprocessing
+
+
+def test_convert_geojson_2_raster(tmp_path):
+    """Test rasterizing GeoJSON features into a non-square extent."""
+
+    # a horizontal flowline in the top row and a water body covering exactly one cell
+    feat_layers = [
+        {"features": [{"geometry": {
+            "type": "LineString", "coordinates": [[0.5, 3.5], [9.5, 3.5]]
+        }}]},
+        {"features": [{"geometry": {
+            "type": "Polygon", "coordinates": [[[7., 1.], [8., 1.], [8., 2.], [7., 2.], [7., 1.]]]
+        }}]},
+    ]
+
+    filename = tmp_path.joinpath("hydro.asc")
+    gclandspill._preprocessing.convert_geojson_2_raster(
+        feat_layers, filename, [0., 0., 10., 4.], 1., all_touched_polys=False)
+
+    with rasterio.open(filename, "r") as raster:
+        assert (raster.width, raster.height) == (10, 4)
+        assert list(raster.bounds) == pytest.approx([0., 0., 10., 4.])
+        image = raster.read(1)
+
+    # rows go from north to south, so y in [1, 2] is the third row
+    expected = numpy.full((4, 10), -9999., dtype=image.dtype)
+    expected[0, :] = 10.
+    expected[2, 7] = 10.
+    assert image.shape == (4, 10)
+    assert image == pytest.approx(expected)
@@ -11,13 +11,16 @@
 import os
 import sys
 import csv
+import json
 import pathlib
+import numpy
 import pytest
 import rasterio
 import matplotlib
 import matplotlib.pyplot
 import gclandspill.__main__
 import gclandspill.pyclaw
+import gclandspill._postprocessing.calc
 
 
 @pytest.fixture(scope="session")
@@ -205,6 +208,52 @@ def test_volumes(create_case):
             assert line_2 == pytest.approx(line_1)
 
 
+def test_batch(create_case, tmp_path):
+    """Test subcommand batch with two volumes jobs on the reference raw results."""
+    case_dir = create_case
+    ref_dir = pathlib.Path(__file__).parent.joinpath("data", "regression-1")
+
+    jobs = [
+        ["volumes", str(case_dir), "--soln-dir", str(ref_dir), "--dest-dir", str(tmp_path),
+         "--filename", "volumes-{}.csv".format(i), "--nprocs", "1"]
+        for i in range(2)
+    ]
+
+    manifest = tmp_path.joinpath("manifest.json")
+    with open(manifest, "w") as fileobj:
+        json.dump(jobs, fileobj)
+
+    # run the two jobs concurrently
+    sys.argv = ["geoclaw-landspill", "batch", "--nprocs", "2", str(manifest)]
+    assert gclandspill.__main__.main() == 0
+
+    with open(ref_dir.joinpath("volumes.csv"), "r") as ref:
+        ref_lines = list(csv.reader(ref))
+
+    for i in range(2):
+        with open(tmp_path.joinpath("volumes-{}.csv".format(i)), "r") as result:
+            lines = list(csv.reader(result))
+
+        assert lines[0] == ref_lines[0]
+        assert len(lines) == len(ref_lines)
+        for line, ref_line in zip(lines[1:], ref_lines[1:]):
+            assert [float(val) for val in line] == pytest.approx([float(val) for val in ref_line])
+
+
+def test_total_volume_reference():
+    """Test if the volumes calculated from the reference raw results match the reference CSV."""
+    ref_dir = pathlib.Path(__file__).parent.joinpath("data", "regression-1")
+
+    with open(ref_dir.joinpath("volumes.csv"), "r") as ref:
+        lines = list(csv.reader(ref))[1:]
+
+    for nprocs in [1, 2]:
+        data = gclandspill._postprocessing.calc.get_total_volume(ref_dir, 0, 6, 2, nprocs)
+        assert len(data) == len(lines)
+        for line, vols in zip(lines, data):
+            assert list(vols) == pytest.approx([float(i) for i in line[1:]])
+
+
 def test_evaporated_fluid(create_case):
     """Test the value in evaporated_fluid.dat."""
     case_dir = create_case
@@ -215,3 +264,36 @@ def test_evaporated_fluid(create_case):
         val_1 = float(ref.read())
         val_2 = float(result.read())
         assert val_2 == pytest.approx(val_1)
+
+
+def test_topo_lims_cache(tmp_path, monkeypatch):
+    """Test the on-disk cache of get_topo_lims: a miss, a hit, and invalidation by mtime."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path.joinpath("cache")))
+    cache_dir = tmp_path.joinpath("cache", "gclandspill", "topo_lims")
+    topo_file = tmp_path.joinpath("toy.asc")
+
+    def write_topo(value):
+        with open(topo_file, "w") as fileobj:
+            fileobj.write("ncols 2\nnrows 2\nxllcorner 0.0\nyllcorner 0.0\ncellsize 1.0\n")
+            fileobj.write("NODATA_value -9999\n{0} 1.0\n1.0 1.0\n".format(value))
+
+    # a miss: computed from the raster and written to the cache
+    write_topo(-3.0)
+    lims = gclandspill._postprocessing.calc.get_topo_lims([topo_file])
+    assert lims == (-3.0, 1.0)
+    assert all(isinstance(val, float) for val in lims)
+    cache_files = list(cache_dir.glob("*.npy"))
+    assert len(cache_files) == 1
+
+    # a hit: tamper with the cached values to make sure they are what get returned
+    numpy.save(cache_files[0], numpy.array([-100., 100.]))
+    lims = gclandspill._postprocessing.calc.get_topo_lims([topo_file])
+    assert lims == (-100., 100.)
+    assert all(isinstance(val, float) for val in lims)
+
+    # invalidation: a new modification time gives a new key, so the raster is read again
+    write_topo(-5.0)
+    stat = os.stat(topo_file)
+    os.utime(topo_file, ns=(stat.st_atime_ns, stat.st_mtime_ns+10**9))
+    assert gclandspill._postprocessing.calc.get_topo_lims([topo_file]) == (-5.0, 1.0)
+    assert len(list(cache_dir.glob("*.npy"))) == 2